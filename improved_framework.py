@@ -7,17 +7,164 @@ from __future__ import annotations
 
 import json
 import re
+import sys
 import logging
 from typing import Dict, Tuple, List, Optional, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 
+# orjson is an optional accelerator; fall back to the stdlib parser.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers are shared.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 __all__ = [
     "ImprovedFramework",
     "ValidationResult",
     "ParseResult",
 ]
 
+# ------------------------------------------------------------------
+# Precompiled patterns (compiled once at import, shared by all instances)
+# ------------------------------------------------------------------
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Only untagged or json-tagged fences hold JSON (same rule as main._strip_fences);
+# ```python and other code blocks are left alone
+_MARKDOWN_FENCE = re.compile(r"```(?:json)?\s*\n(.*?)\n```", re.DOTALL | re.I)
+
+# Score patterns in precedence order. Each kind is applied to the whole text
+# in turn, so when a key repeats the later kind wins (dash > assignment >
+# categorical > numeric), and "\s*" may run across newlines.
+_SCORE_PATTERNS = tuple(re.compile(p, re.I) for p in (
+    r"(\w+):\s*(\d+)(?:/10)?(?:\s*(?:out of|\/)\s*10)?",  # numeric scores
+    r"(\w+):\s*(High|Medium|Low|Excellent|Good|Fair|Poor)",  # categorical
+    r"(\w+)\s*=\s*(\d+)",  # assignment style
+    r"(\w+)\s*-\s*(\d+)",  # dash style
+))
+
+# Categorical score words mapped to numeric values
+_CATEGORY_SCORES = {
+    "excellent": 9, "high": 8, "good": 7, "medium": 5,
+    "fair": 4, "low": 3, "poor": 2
+}
+
+# Patch note labels, in priority order: the first label found anywhere in the
+# text wins, even if a lower-priority label appears earlier on the same line
+_NOTE_PATTERNS = tuple(re.compile(p, re.I) for p in (
+    r"(?:patch[_\s]?note|note|comment):\s*(.+?)(?:\n|$)",
+    r"(?:summary|conclusion):\s*(.+?)(?:\n|$)",
+    r"(?:improvement|suggestion):\s*(.+?)(?:\n|$)",
+))
+
+# Stage keyword classifier: each tag lists the literal keywords that must occur
+# in the lowercased response (C-level substring checks) and, where the literal
+# alone is not enough, a pattern run only to confirm a literal hit
+_STAGE_KEYWORDS = {
+    "success": (("success", "accomplished", "achieved"),
+                re.compile(r"(?:success|accomplished|achieved).*today")),
+    "constraint": (("constraint", "limitation", "blocking", "obstacle"), None),
+    "signal": (("signal",), re.compile(r"(?:winning|key|primary)\s+signal")),
+    "micro": (("micro", "quick", "immediate"),
+              re.compile(r"micro[-\s]?(?:sprint|step|action)|quick\s+action|immediate\s+step")),
+}
+
+_BULLET_PATTERNS = tuple(re.compile(p) for p in (
+    r"(?:^|\n)\s*(?:[-*•]|\d+[.)])\s+.+",
+    r"(?:^|\n)\s*[•▪▫]\s+.+",
+))
+
+# Matched against the lowercased response, so no re.I
+_THEME_PATTERNS = tuple(re.compile(p) for p in (
+    r"theme\s*\d*[:\-]", r"category\s*\d*[:\-]", r"area\s*\d*[:\-]",
+))
+
+_STEP_PATTERNS = tuple(re.compile(p, re.I) for p in (
+    r"(?:^|\n)\s*(?:[-*•]|\d+[.)])\s*(?:step\s*\d*:?)?(.+)",
+    r"(?:^|\n)\s*(?:step\s*\d+|action\s*\d*)[:\-]\s*(.+)",
+))
+
+# Structure indicators as zero-width alternatives: one scan finds every kind,
+# and overlapping kinds (e.g. "**Step 1**") are still each counted.
+# Matched against the original response with re.I: lowercasing first would
+# change what \w and \d see for some non-ASCII text (e.g. 'İ'.lower() is two code points)
+_STRUCTURE_PATTERN = re.compile(
+    r"(?=(?P<bullet>\n\s*(?:[-*•]|\d+[.)])))"  # bullets/numbers
+    r"|(?=(?P<pair>\n\s*\w+:))"  # key-value pairs
+    r"|(?=(?P<bold>\*\*[^*]+\*\*))"  # bold text (markdown)
+    r"|(?=(?P<step>(?:step|action|phase)\s*\d+))",  # numbered steps
+    re.I,
+)
+_STRUCTURE_KINDS = 4
+
+def _fence_candidates(text: str):
+    """Yield fenced-block contents: a cheap str.find slice first, the regex only as fallback"""
+    start = text.find("```")
+    newline = text.find("\n", start)
+    if newline != -1 and text[start + 3:newline].strip().lower() in ("", "json"):
+        end = text.find("```", newline + 1)
+        if end != -1:
+            yield text[newline + 1:end]
+    cleaned = _MARKDOWN_FENCE.sub(r"\1", text)
+    if cleaned != text:
+        yield cleaned
+
+def _keyword_hits(lowered: str, *tags: str) -> Dict[str, bool]:
+    """Classify a lowercased response against the requested stage keyword tags"""
+    hits = {}
+    for tag in tags:
+        literals, confirm = _STAGE_KEYWORDS[tag]
+        found = any(word in lowered for word in literals)
+        if found and confirm is not None:
+            found = confirm.search(lowered) is not None
+        hits[tag] = found
+    return hits
+
+def _count_bullet_lines(text: str) -> Optional[int]:
+    """Count bullet/numbered lines the way _BULLET_PATTERNS do, without the regex engine.
+
+    Returns None for marker-only lines, where the patterns' \\s+ would run on
+    into the following line; callers fall back to the regexes then.
+    """
+    count = 0
+    for line in text.split("\n"):
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+        first = stripped[0]
+        if first.isdecimal():
+            end = 1
+            while end < len(stripped) and stripped[end].isdecimal():
+                end += 1
+            if end == len(stripped) or stripped[end] not in ".)":
+                continue
+            rest = stripped[end + 1:]
+            hits = 1
+        elif first in "-*•▪▫":
+            rest = stripped[1:]
+            hits = (first in "-*•") + (first in "•▪▫")  # "•" matches both patterns
+        else:
+            continue
+        if not rest or rest.isspace():
+            return None
+        if rest[0].isspace():
+            count += hits
+    return count
+
+def _structure_score(text: str) -> int:
+    """Count distinct structure indicator kinds in one pass, stopping once all are seen"""
+    kinds = set()
+    # A leading newline stands in for '^', so line-start kinds never share a
+    # start position with "**bold**" / "step 1" at offset 0
+    for match in _STRUCTURE_PATTERN.finditer("\n" + text):
+        kinds.add(match.lastgroup)
+        if len(kinds) == _STRUCTURE_KINDS:
+            break
+    return len(kinds)
+
 class ValidationStatus(Enum):
     """Status codes for validation results"""
     SUCCESS = "success"
@@ -25,7 +172,14 @@ class ValidationStatus(Enum):
     FAILED = "failed"
     UNKNOWN_STAGE = "unknown_stage"
 
-@dataclass
+# Result objects are created on every parse/validation; drop their __dict__
+# where dataclasses support it (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Statuses the legacy boolean validator reports as passing
+_PASSING_STATUSES = frozenset((ValidationStatus.SUCCESS, ValidationStatus.PARTIAL))
+
+@dataclass(**_DATACLASS_SLOTS)
 class ValidationResult:
     """Structured validation result with detailed feedback"""
     status: ValidationStatus
@@ -33,7 +187,7 @@ class ValidationResult:
     score: float  # 0.0 to 1.0
     details: Dict[str, Any]
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ParseResult:
     """Structured parsing result with metadata"""
     data: Dict[str, Any]
@@ -66,6 +220,9 @@ class ImprovedFramework:
             "4": self._validate_stage4_enhanced,
             "meta": self._validate_meta_enhanced,
         }
+        # Numbered stages dispatch by index; other keys fall back to the dict
+        self._stage_dispatch = tuple(self.stage_validators[str(i)] for i in range(5))
+        self._meta_validator = self._validate_meta_enhanced
         
         # Scoring weights for heuristic evaluation
         self.heuristic_weights = {
@@ -93,8 +250,9 @@ class ImprovedFramework:
     def robust_json_parser(self, raw_response: str) -> ParseResult:
         """Enhanced JSON parser that returns structured results with metadata"""
         warnings = []
+        stripped = raw_response.strip() if raw_response else ""
         
-        if not raw_response or not raw_response.strip():
+        if not stripped:
             return ParseResult(
                 data={"scores": {}, "patch_note": "Empty response", "parsing_error": True},
                 success=False,
@@ -103,63 +261,67 @@ class ImprovedFramework:
                 warnings=["Empty or whitespace-only input"]
             )
 
+        # Prefilter on the first character: prose or fenced output can never
+        # parse directly, so skip straight to the strategies that can help.
+        first = stripped[0]
+
         # Strategy 1: Direct JSON parsing
-        try:
-            data = json.loads(raw_response)
-            return ParseResult(
-                data=data,
-                success=True,
-                method_used="direct_json",
-                confidence=1.0,
-                warnings=[]
-            )
-        except json.JSONDecodeError as e:
-            self.logger.debug(f"Direct JSON parse failed: {e}")
+        if first in "{[":
+            try:
+                data = _json_loads(stripped)
+                return ParseResult(
+                    data=data,
+                    success=True,
+                    method_used="direct_json",
+                    confidence=1.0,
+                    warnings=[]
+                )
+            except json.JSONDecodeError as e:
+                self.logger.debug("Direct JSON parse failed: %s", e)
 
         # Strategy 2: Remove markdown code fences
-        try:
-            cleaned = re.sub(r"```(?:json)?\s*\n(.*?)\n```", r"\1", raw_response, flags=re.DOTALL)
-            if cleaned != raw_response:
-                data = json.loads(cleaned)
-                warnings.append("Removed markdown code fences")
+        if "```" in stripped:
+            for cleaned in _fence_candidates(stripped):
+                try:
+                    data = _json_loads(cleaned)
+                    warnings.append("Removed markdown code fences")
+                    return ParseResult(
+                        data=data,
+                        success=True,
+                        method_used="markdown_cleanup",
+                        confidence=0.9,
+                        warnings=warnings
+                    )
+                except json.JSONDecodeError as e:
+                    self.logger.debug("Markdown cleanup parse failed: %s", e)
+
+        # Strategy 3: Extract first JSON object
+        # raw_decode runs in the C scanner and stops at the matching brace,
+        # so nested objects and braces inside strings are handled for us.
+        # Plain prose usually has no '{' at all, so test that first (memchr)
+        # and skip the strategy; candidates after the last '}' can never
+        # close, so bound the scan there.
+        idx = raw_response.find('{')
+        if idx != -1:
+            last_close = raw_response.rfind('}', idx)
+            if last_close == -1:
+                idx = -1
+            log_debug = self.logger.isEnabledFor(logging.DEBUG)
+        while idx != -1:
+            try:
+                data, _end = _JSON_DECODER.raw_decode(raw_response, idx)
+                warnings.append("Extracted first JSON object from text")
                 return ParseResult(
                     data=data,
                     success=True,
-                    method_used="markdown_cleanup",
-                    confidence=0.9,
+                    method_used="json_extraction",
+                    confidence=0.8,
                     warnings=warnings
                 )
-        except json.JSONDecodeError as e:
-            self.logger.debug(f"Markdown cleanup parse failed: {e}")
-
-        # Strategy 3: Extract first JSON object
-        try:
-            # More sophisticated regex to handle nested braces
-            brace_count = 0
-            start_idx = -1
-            
-            for i, char in enumerate(raw_response):
-                if char == '{' and start_idx == -1:
-                    start_idx = i
-                    brace_count = 1
-                elif start_idx != -1:
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            json_str = raw_response[start_idx:i+1]
-                            data = json.loads(json_str)
-                            warnings.append("Extracted first JSON object from text")
-                            return ParseResult(
-                                data=data,
-                                success=True,
-                                method_used="json_extraction",
-                                confidence=0.8,
-                                warnings=warnings
-                            )
-        except json.JSONDecodeError as e:
-            self.logger.debug(f"JSON extraction failed: {e}")
+            except json.JSONDecodeError as e:
+                if log_debug:
+                    self.logger.debug("JSON extraction failed at %d: %s", idx, e)
+                idx = raw_response.find('{', idx + 1, last_close)
 
         # Strategy 4: Heuristic construction
         try:
@@ -173,14 +335,14 @@ class ImprovedFramework:
                 warnings=warnings
             )
         except Exception as e:
-            self.logger.debug(f"Heuristic construction failed: {e}")
+            self.logger.debug("Heuristic construction failed: %s", e)
 
         # Final fallback
-        preview = raw_response[:100] + "..." if len(raw_response) > 100 else raw_response
+        ellipsis = "..." if len(raw_response) > 100 else ""
         return ParseResult(
             data={
                 "scores": {},
-                "patch_note": f"All parsing strategies failed. Preview: {preview}",
+                "patch_note": f"All parsing strategies failed. Preview: {raw_response[:100]}{ellipsis}",
                 "parsing_error": True,
             },
             success=False,
@@ -193,37 +355,18 @@ class ImprovedFramework:
         """Enhanced heuristic JSON construction with better pattern matching"""
         result: Dict[str, Any] = {"scores": {}, "patch_note": ""}
         
-        # More comprehensive patterns
-        score_patterns = [
-            r"(\w+):\s*(\d+)(?:/10)?(?:\s*(?:out of|\/)\s*10)?",  # numeric scores
-            r"(\w+):\s*(High|Medium|Low|Excellent|Good|Fair|Poor)",  # categorical
-            r"(\w+)\s*=\s*(\d+)",  # assignment style
-            r"(\w+)\s*-\s*(\d+)",  # dash style
-        ]
-        
-        for pattern in score_patterns:
-            matches = re.findall(pattern, text, flags=re.IGNORECASE)
-            for key, val in matches:
+        for pattern in _SCORE_PATTERNS:
+            for key, val in pattern.findall(text):
                 key = key.lower().strip()
                 if val.isdigit():
                     result["scores"][key] = min(10, max(0, int(val)))  # clamp to 0-10
                 else:
                     # Convert categorical to numeric
-                    cat_map = {
-                        "excellent": 9, "high": 8, "good": 7, "medium": 5,
-                        "fair": 4, "low": 3, "poor": 2
-                    }
-                    result["scores"][key] = cat_map.get(val.lower(), 5)
+                    result["scores"][key] = _CATEGORY_SCORES.get(val.lower(), 5)
 
         # Enhanced patch note extraction
-        note_patterns = [
-            r"(?:patch[_\s]?note|note|comment):\s*(.+?)(?:\n|$)",
-            r"(?:summary|conclusion):\s*(.+?)(?:\n|$)",
-            r"(?:improvement|suggestion):\s*(.+?)(?:\n|$)",
-        ]
-        
-        for pattern in note_patterns:
-            match = re.search(pattern, text, flags=re.IGNORECASE)
+        for pattern in _NOTE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 result["patch_note"] = match.group(1).strip()
                 break
@@ -239,7 +382,12 @@ class ImprovedFramework:
 
     def enhanced_stage_validator(self, stage: str, response: str) -> ValidationResult:
         """Enhanced validator that returns structured results"""
-        validator = self.stage_validators.get(stage)
+        if stage == "meta":
+            validator = self._meta_validator
+        elif isinstance(stage, str) and len(stage) == 1 and "0" <= stage <= "4":
+            validator = self._stage_dispatch[int(stage)]
+        else:
+            validator = self.stage_validators.get(stage)
         if not validator:
             return ValidationResult(
                 status=ValidationStatus.UNKNOWN_STAGE,
@@ -248,20 +396,21 @@ class ImprovedFramework:
                 details={"stage": stage}
             )
         
-        return validator(response)
+        # Lowercase once here; validators match keywords against it without re.I
+        return validator(response, response.lower())
 
-    def _validate_stage0_enhanced(self, response: str) -> ValidationResult:
+    def _validate_stage0_enhanced(self, response: str, lowered: str) -> ValidationResult:
         """Enhanced Stage 0 validation with partial success detection"""
         details = {}
         
+        hits = _keyword_hits(lowered, "success", "constraint")
+        
         # Check for success indicators
-        success_patterns = [r"success.*today", r"accomplished.*today", r"achieved.*today"]
-        success_found = any(re.search(p, response, re.I) for p in success_patterns)
+        success_found = hits["success"]
         details["success_statement"] = success_found
         
         # Check for constraint identification
-        constraint_patterns = [r"(?:primary\s+)?constraint", r"limitation", r"blocking", r"obstacle"]
-        constraint_found = any(re.search(p, response, re.I) for p in constraint_patterns)
+        constraint_found = hits["constraint"]
         details["constraint_identification"] = constraint_found
         
         # Calculate score and status
@@ -285,27 +434,22 @@ class ImprovedFramework:
         
         return ValidationResult(status=status, message=message, score=score, details=details)
 
-    def _validate_stage1_enhanced(self, response: str) -> ValidationResult:
+    def _validate_stage1_enhanced(self, response: str, lowered: str) -> ValidationResult:
         """Enhanced Stage 1 validation"""
         details = {}
         
         # Count structured items (bullets, numbers, etc.)
-        bullet_patterns = [
-            r"(?:^|\n)\s*(?:[-*•]|\d+[.)])\s+.+",
-            r"(?:^|\n)\s*[•▪▫]\s+.+",
-        ]
-        bullet_items = []
-        for pattern in bullet_patterns:
-            bullet_items.extend(re.findall(pattern, response))
+        bullet_count = _count_bullet_lines(response)
+        if bullet_count is None:
+            bullet_count = sum(len(p.findall(response)) for p in _BULLET_PATTERNS)
         
         # Count theme indicators
-        theme_patterns = [r"theme\s*\d*[:\-]", r"category\s*\d*[:\-]", r"area\s*\d*[:\-]"]
-        theme_count = sum(len(re.findall(p, response, re.I)) for p in theme_patterns)
+        theme_count = sum(len(p.findall(lowered)) for p in _THEME_PATTERNS)
         
-        item_count = max(len(bullet_items), theme_count)
+        item_count = max(bullet_count, theme_count)
         details["item_count"] = item_count
         details["theme_count"] = theme_count
-        details["bullet_items"] = len(bullet_items)
+        details["bullet_items"] = bullet_count
         
         # Scoring
         if item_count >= 3:
@@ -323,27 +467,23 @@ class ImprovedFramework:
         
         return ValidationResult(status=status, message=message, score=score, details=details)
 
-    def _validate_stage3_enhanced(self, response: str) -> ValidationResult:
+    def _validate_stage3_enhanced(self, response: str, lowered: str) -> ValidationResult:
         """Enhanced Stage 3 validation - the stage from your example"""
         details = {}
         
+        hits = _keyword_hits(lowered, "signal", "micro")
+        
         # Check for winning signal
-        signal_patterns = [r"winning\s+signal", r"key\s+signal", r"primary\s+signal"]
-        signal_found = any(re.search(p, response, re.I) for p in signal_patterns)
+        signal_found = hits["signal"]
         details["winning_signal"] = signal_found
         
         # Count action steps
-        step_patterns = [
-            r"(?:^|\n)\s*(?:[-*•]|\d+[.)])\s*(?:step\s*\d*:?)?(.+)",
-            r"(?:^|\n)\s*(?:step\s*\d+|action\s*\d*)[:\-]\s*(.+)",
-        ]
         steps = []
-        for pattern in step_patterns:
-            steps.extend(re.findall(pattern, response, re.I))
+        for pattern in _STEP_PATTERNS:
+            steps.extend(pattern.findall(response))
         
         # Also check for micro-sprint/micro-step indicators
-        micro_patterns = [r"micro[-\s]?(?:sprint|step|action)", r"quick\s+action", r"immediate\s+step"]
-        micro_found = any(re.search(p, response, re.I) for p in micro_patterns)
+        micro_found = hits["micro"]
         details["micro_actions"] = micro_found
         
         step_count = len(steps)
@@ -382,16 +522,16 @@ class ImprovedFramework:
         return ValidationResult(status=status, message=message, score=score, details=details)
 
     # Placeholder implementations for other stages
-    def _validate_stage2_enhanced(self, response: str) -> ValidationResult:
+    def _validate_stage2_enhanced(self, response: str, lowered: str) -> ValidationResult:
         # Similar pattern to stage 3, checking for patterns, motivation, emotional shifts
         # Implementation would follow same pattern as above
         return ValidationResult(ValidationStatus.SUCCESS, "Stage 2 validation placeholder", 0.8, {})
     
-    def _validate_stage4_enhanced(self, response: str) -> ValidationResult:
+    def _validate_stage4_enhanced(self, response: str, lowered: str) -> ValidationResult:
         # Check for prototype goal, won't build list, checkpoints, completion declaration
         return ValidationResult(ValidationStatus.SUCCESS, "Stage 4 validation placeholder", 0.8, {})
     
-    def _validate_meta_enhanced(self, response: str) -> ValidationResult:
+    def _validate_meta_enhanced(self, response: str, lowered: str) -> ValidationResult:
         # Check for framework analysis, logic reflection, refinement, micro-actions
         return ValidationResult(ValidationStatus.SUCCESS, "Meta validation placeholder", 0.8, {})
 
@@ -408,14 +548,7 @@ class ImprovedFramework:
         word_count = len(response.split())
         
         # Enhanced structure detection
-        structure_indicators = [
-            r"(?:^|\n)\s*(?:[-*•]|\d+[.)])",  # bullets/numbers
-            r"(?:^|\n)\s*\w+:",  # key-value pairs
-            r"\*\*[^*]+\*\*",  # bold text (markdown)
-            r"(?:step|action|phase)\s*\d+",  # numbered steps
-        ]
-        structure_score = sum(1 for pattern in structure_indicators 
-                            if re.search(pattern, response, re.I))
+        structure_score = _structure_score(response)
         has_structure = structure_score > 0
         
         # Word count scoring (more sophisticated)
@@ -457,5 +590,5 @@ class ImprovedFramework:
     def simplified_stage_validator(self, stage: str, response: str) -> Tuple[bool, str]:
         """Legacy method for backward compatibility"""
         result = self.enhanced_stage_validator(stage, response)
-        success = result.status in [ValidationStatus.SUCCESS, ValidationStatus.PARTIAL]
+        success = result.status in _PASSING_STATUSES
         return success, result.message
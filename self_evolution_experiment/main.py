@@ -29,19 +29,58 @@ System: "[Resize] Let's work backward - what does 'done' look like?
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import hashlib
+import importlib.util
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import random
 import re
 import sys
 import time
 import uuid
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
+from typing import TYPE_CHECKING
 
 import duckdb
 from dotenv import load_dotenv
-from openai import OpenAI
+
+# openai (with httpx and pydantic under it) is most of this module's import
+# time, so it is imported inside the client builders, on first use
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+# orjson is an optional accelerator for the JSON hot paths
+try:
+    import orjson
+
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+# HTTP/2 lets concurrent requests multiplex over one TCP+TLS session; it needs
+# the optional h2 package, so fall back to pooled HTTP/1.1 keep-alive without it
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# The async client holds up better under many concurrent requests on an
+# aiohttp transport. That needs the openai[aiohttp] extra (httpx_aiohttp), not
+# just aiohttp; find_spec checks for it without importing it
+_AIOHTTP = importlib.util.find_spec("httpx_aiohttp") is not None
 
 # ── Optional Enhanced Utilities ────────────────────────────────────────────
 # We import the improved helpers *lazily* so the original script keeps working
@@ -65,6 +104,22 @@ load_dotenv()
 DEEPSEEK_BASE_URL = os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com/v1")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY") or os.getenv("OPENAI_API_KEY")
 MODEL = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
+
+# Per-call diagnostics go through a logger so their formatting is skipped
+# unless enabled; set SELF_EVO_LOG_LEVEL=DEBUG to see request/parse traces.
+# main() attaches the stderr handler; library callers configure their own.
+log = logging.getLogger(__name__)
+
+def _env_log_level(name: str = "SELF_EVO_LOG_LEVEL") -> int:
+    """Level named by the environment variable, or WARNING if it is not a level name."""
+    value = os.getenv(name, "WARNING")
+    level = logging.getLevelName(value.strip().upper())
+    if isinstance(level, int):
+        return level
+    log.warning("⚠️ Ignoring %s=%r (not a log level name); using WARNING", name, value)
+    return logging.WARNING
+
+log.setLevel(_env_log_level())
 DB_PATH = Path("self_evo_logs.duckdb").resolve()
 
 # ── Updated STAGE_SYSTEM_MESSAGES ────────────────────────────────────────────
@@ -127,7 +182,25 @@ STAGE_SYSTEM_MESSAGES = {
     )
 }
 
+# ── Exit rule patterns (compiled once at import) ────────────────────────────
+# The pure exit rules below are memoised: retries and re-validation of stored
+# responses hit the same strings, and str hashes are cached on the object
+_EXIT_RULE_CACHE_SIZE = 256
+
+# Only the heading is matched by regex; the section body (up to the first blank
+# line) is cut with str.find, so there is no lazy quantifier to backtrack over
+_KEY_THEMES_RE = re.compile(r"Key Themes:\s*", re.IGNORECASE)
+_THEME_LINE_RE = re.compile(r"^\s*(?:[-*]|\d+[.)])\s+.+", re.MULTILINE)
+# Both Stage 0 headings in one scan with a shared prefix; the lookahead keeps
+# each match zero-width so a heading whose value wraps onto the next line
+# cannot swallow the other
+_STAGE0_HEADINGS_RE = re.compile(
+    r"(?=(?:^|\n)\s*(?:[#*>_`-]*\s*)?(?:\*\*|__)?\s*(?P<kind>Success Today|Primary Constraint):\s*.+)",
+    re.I
+)
+
 # ── NEW: Exit Rule Check for Stage 1 ─────────────────────────────────────────
+@lru_cache(maxsize=_EXIT_RULE_CACHE_SIZE)
 def check_stage1_exit_rule(ai_response: str, min_themes: int = 3) -> tuple[bool, str]:
     """
     Checks if the AI identified ≥3 themes in Stage 1.
@@ -136,13 +209,15 @@ def check_stage1_exit_rule(ai_response: str, min_themes: int = 3) -> tuple[bool,
     - Numbered: "1. idea", "2) idea"
     """
     # Find the "Key Themes:" section
-    themes_section = re.search(r"Key Themes:\s*(.*?)(?=\n\n|\Z)", ai_response, re.DOTALL | re.IGNORECASE)
+    themes_section = _KEY_THEMES_RE.search(ai_response)
     if not themes_section:
         return False, "❌ No 'Key Themes:' section found."
+    body_start = themes_section.end()
+    body_end = ai_response.find("\n\n", body_start)
+    themes_body = ai_response[body_start:body_end] if body_end != -1 else ai_response[body_start:]
     
     # Count bullets/numbers (supports "-", "*", "1.", "2)", etc.)
-    theme_lines = re.findall(r"^\s*(?:[-*]|\d+[.)])\s+.+", themes_section.group(1), re.MULTILINE)
-    theme_count = len(theme_lines)
+    theme_count = sum(1 for _ in _THEME_LINE_RE.finditer(themes_body))
 
     if theme_count >= min_themes:
         return True, f"✅ Stage 1 Exit Rule Met: {theme_count} themes identified."
@@ -150,20 +225,18 @@ def check_stage1_exit_rule(ai_response: str, min_themes: int = 3) -> tuple[bool,
         return False, f"❌ Stage 1 Exit Rule Not Met: Only {theme_count} themes (need ≥{min_themes})."
 
 # ── NEW: check_stage0_exit_rule ──────────────────────────────────────────────
+@lru_cache(maxsize=_EXIT_RULE_CACHE_SIZE)
 def check_stage0_exit_rule(ai_response: str) -> tuple[bool, str]:
     """
     Now ignores Markdown formatting (bold, headers, etc.) before headings.
     """
-    success = re.search(
-        r"(?:^|\n)\s*(?:[#*>_`-]*\s*)?(?:\*\*|__)?\s*Success Today:\s*.+", 
-        ai_response, 
-        re.I
-    )
-    constraint = re.search(
-        r"(?:^|\n)\s*(?:[#*>_`-]*\s*)?(?:\*\*|__)?\s*Primary Constraint:\s*.+", 
-        ai_response, 
-        re.I
-    )
+    found = set()
+    for match in _STAGE0_HEADINGS_RE.finditer(ai_response):
+        found.add(match.group("kind")[0].lower())  # 's'uccess / 'p'rimary
+        if len(found) == 2:
+            break
+    success = "s" in found
+    constraint = "p" in found
     
     if success and constraint:
         return True, "✅ Stage 0 Exit Rule Met – context seeded."
@@ -174,64 +247,85 @@ def check_stage0_exit_rule(ai_response: str) -> tuple[bool, str]:
         return False, f"❌ Stage 0 Exit Rule Not Met – missing: {', '.join(missing)}."
 
 # ── NEW: check_stage2_exit_rule ──────────────────────────────────────────────
+# Relaxed line patterns (leading whitespace allowed, case-insensitive) fused into
+# one zero-width scan; each named group spans exactly what its own pattern did
+_STAGE2_LINE_RE = re.compile(
+    r"^(?=[^\S\n]*(?:"
+    r"(?P<pattern>Pattern\s*\d+\s*:\s*.+)"
+    r"|(?P<evidence>Evidence\s*:\s*.+)"
+    r"|(?P<confidence>Confidence\s*:\s*(?:High|Medium|Low))"
+    r"|(?P<motivation>Core Motivation\s*:\s*.+)"
+    r"|(?P<emotional>Emotional Shift\s*:\s*.+)))",
+    re.MULTILINE | re.IGNORECASE
+)
+_STAGE2_REQUIRED = {"pattern": 2, "evidence": 2, "confidence": 2, "motivation": 1, "emotional": 1}
+# First letters a component line can start with (Pattern, Evidence/Emotional, Confidence/Core)
+_STAGE2_HEADS = frozenset("pPeEcC")
+
+@lru_cache(maxsize=_EXIT_RULE_CACHE_SIZE)
 def check_stage2_exit_rule(ai_response: str) -> tuple[bool, str]:
     """
     More flexible validation that still ensures all components exist
     """
-    # Relaxed regex: allow leading whitespace, ignore bold/markup, case-insensitive
-    patterns    = re.findall(r"^\s*Pattern\s*\d+\s*:\s*.+", ai_response, re.MULTILINE | re.IGNORECASE)
-    evidences   = re.findall(r"^\s*Evidence\s*:\s*.+", ai_response, re.MULTILINE | re.IGNORECASE)
-    confidences = re.findall(
-        r"^\s*Confidence\s*:\s*(?:High|Medium|Low)",
-        ai_response,
-        re.MULTILINE | re.IGNORECASE
-    )
-
-    # The "Core Motivation" and "Emotional Shift" lines may also have leading whitespace or markdown
-    motivation = re.search(
-        r"^\s*Core Motivation\s*:\s*.+",
-        ai_response,
-        re.MULTILINE | re.IGNORECASE
-    )
-    emotional = re.search(
-        r"^\s*Emotional Shift\s*:\s*.+",
-        ai_response,
-        re.MULTILINE | re.IGNORECASE
-    )
+    # One walk over the lines, stopping once every component is present; the
+    # regex only runs on lines whose first non-blank letter could start one
+    counts = dict.fromkeys(_STAGE2_REQUIRED, 0)
+    ends = dict.fromkeys(_STAGE2_REQUIRED, 0)
+    offset = 0
+    for line in ai_response.split("\n"):
+        start = offset
+        offset += len(line) + 1
+        if line.lstrip()[:1] not in _STAGE2_HEADS:
+            continue
+        match = _STAGE2_LINE_RE.match(ai_response, start)
+        if match is None:
+            continue
+        kind = match.lastgroup
+        if match.start(kind) < ends[kind]:
+            continue  # already consumed by the previous value of this kind (e.g. "Pattern 1:\nPattern 2: x")
+        counts[kind] += 1
+        ends[kind] = match.end(kind)
+        if all(counts[k] >= n for k, n in _STAGE2_REQUIRED.items()):
+            break
 
-    if (len(patterns) >= 2 and len(evidences) >= 2 and len(confidences) >= 2 
-        and motivation and emotional):
+    if all(counts[k] >= n for k, n in _STAGE2_REQUIRED.items()):
         return True, "✅ Stage 2 Exit Rule Met - Ready for Signal Scan"
     else:
         missing = []
-        if len(patterns) < 2: missing.append("Patterns")
-        if len(evidences) < 2: missing.append("Evidences")
-        if len(confidences) < 2: missing.append("Confidences")
-        if not motivation: missing.append("Core Motivation")
-        if not emotional: missing.append("Emotional Shift")
+        if counts["pattern"] < 2: missing.append("Patterns")
+        if counts["evidence"] < 2: missing.append("Evidences")
+        if counts["confidence"] < 2: missing.append("Confidences")
+        if not counts["motivation"]: missing.append("Core Motivation")
+        if not counts["emotional"]: missing.append("Emotional Shift")
         return False, f"❌ Stage 2 Exit Rule Not Met - Missing: {', '.join(missing)}"
 
 # ── NEW: check_stage3_exit_rule ──────────────────────────────────────────────
-
-def check_stage3_exit_rule(ai_response: str, user_prompt: str = "") -> tuple[bool, str]:
+# Negative constraints in user prompts (matched against the lowercased prompt)
+_NEGATIVE_CONSTRAINT_RES = tuple(re.compile(phrase) for phrase in (
+    "do not offer",
+    "no actionable steps",
+    "no advice",
+    "no ding-ding-ding",
+    "only confirm",
+    "nothing more than",
+    "exactly [0-9]+ words",
+))
+_WINNING_SIGNAL_RE = re.compile(r"Winning\s+Signal\s*:", re.I)
+_MICRO_SPRINT_RE = re.compile(r"Micro[-\s]?Sprint\s+Plan\s*:", re.I)
+_NUMBERED_STEP_RE = re.compile(r"\b\d+[.)]\s+")
+
+def check_stage3_exit_rule(ai_response: str, user_prompt: str = "", prompt_lower: str | None = None) -> tuple[bool, str]:
     """
     Enhanced Stage 3 validator that respects negative constraints in user prompts.
     Now takes user_prompt as an optional parameter to detect constraint instructions.
+    Callers that already lowercased the prompt can pass it as ``prompt_lower``.
     """
     # Detect negative constraints in user prompt
-    CONSTRAINT_PHRASES = [
-        "do not offer",
-        "no actionable steps",
-        "no advice",
-        "no ding-ding-ding",
-        "only confirm",
-        "nothing more than",
-        "exactly [0-9]+ words"
-    ]
-    
+    if prompt_lower is None:
+        prompt_lower = user_prompt.lower()
     has_negative_constraints = any(
-        re.search(phrase, user_prompt.lower()) 
-        for phrase in CONSTRAINT_PHRASES
+        pattern.search(prompt_lower)
+        for pattern in _NEGATIVE_CONSTRAINT_RES
     )
 
     if has_negative_constraints:
@@ -239,11 +333,11 @@ def check_stage3_exit_rule(ai_response: str, user_prompt: str = "") -> tuple[boo
         violations = []
         
         # Check for prohibited components
-        if re.search(r"Winning\s+Signal\s*:", ai_response, re.I):
+        if _WINNING_SIGNAL_RE.search(ai_response):
             violations.append("Winning Signal")
-        if re.search(r"Micro[-\s]?Sprint\s+Plan\s*:", ai_response, re.I):
+        if _MICRO_SPRINT_RE.search(ai_response):
             violations.append("Micro-Sprint Plan")
-        if re.search(r"\b\d+[.)]\s+", ai_response):  # Numbered steps
+        if _NUMBERED_STEP_RE.search(ai_response):  # Numbered steps
             violations.append("actionable steps")
             
         if not violations:
@@ -262,21 +356,25 @@ def check_stage3_exit_rule(ai_response: str, user_prompt: str = "") -> tuple[boo
     return original_check_stage3_exit_rule(ai_response)
 
 # Keep original implementation as fallback
+_STAGE3_EMPHASIS_RE = re.compile(r"[*_]{1,2}(.*?)[_*]{1,2}")
+_WINNING_LINE_RE = re.compile(r"^\s*(?:[#*>_`-]*\s*)?Winning\s+Signal\s*[:\-–]\s*.+", re.MULTILINE | re.IGNORECASE)
+_MICRO_SECTION_RE = re.compile(r"Micro[-\s]?Sprint\s+Plan\s*[:\-–]\s*(.*?)(?=\n\s*(?:[#*>_`-]*\s*)?\w|$)", re.DOTALL | re.IGNORECASE)
+# Helper to count lines that look like a list item
+_STAGE3_BULLET_RE = re.compile(r"(?:^|\n)\s*(?:[-*]|\d+[.)])\s+", re.MULTILINE)
+
 def original_check_stage3_exit_rule(ai_response: str) -> tuple[bool, str]:
     """Original Stage 3 validator (unchanged as fallback)"""
     # Remove bold/italics markers for easier pattern match
-    plain = re.sub(r"[*_]{1,2}(.*?)[_*]{1,2}", r"\1", ai_response)
+    plain = _STAGE3_EMPHASIS_RE.sub(r"\1", ai_response)
 
-    winning = re.search(r"^\s*(?:[#*>_`-]*\s*)?Winning\s+Signal\s*[:\-–]\s*.+", plain, re.MULTILINE | re.IGNORECASE)
+    winning = _WINNING_LINE_RE.search(plain)
 
-    micro_sec = re.search(r"Micro[-\s]?Sprint\s+Plan\s*[:\-–]\s*(.*?)(?=\n\s*(?:[#*>_`-]*\s*)?\w|$)", plain, re.DOTALL | re.IGNORECASE)
+    micro_sec = _MICRO_SECTION_RE.search(plain)
     bullets = []
-    # Helper to count lines that look like a list item
-    bullet_pattern = re.compile(r"(?:^|\n)\s*(?:[-*]|\d+[.)])\s+", re.MULTILINE)
     if micro_sec:
-        bullets = bullet_pattern.findall(micro_sec.group(1))
+        bullets = _STAGE3_BULLET_RE.findall(micro_sec.group(1))
     if not bullets:
-        bullets = bullet_pattern.findall(plain)
+        bullets = _STAGE3_BULLET_RE.findall(plain)
 
     if winning and len(bullets) >= 3:
         return True, f"✅ Stage 3 Exit Rule Met – Winning Signal + {len(bullets)} micro-steps."
@@ -288,7 +386,18 @@ def original_check_stage3_exit_rule(ai_response: str) -> tuple[bool, str]:
     return False, f"❌ Stage 3 Exit Rule Not Met – missing: {', '.join(missing)}."
 
 # ── NEW: check_stage4_exit_rule ──────────────────────────────────────────────
-
+_STAGE4_EMPHASIS_RE = re.compile(r"[*_]{1,2}(.*?)?[*_]{1,2}")
+_GOAL_RE = re.compile(r"^\s*(?:[#*>_`-]*\s*)?Prototype\s+Goal\s*[:\-–]\s*.+", re.MULTILINE | re.IGNORECASE)
+# Won't Build List – capture block until next header or EOF
+_WONT_BUILD_RE = re.compile(
+    r"Won't\s+Build\s+List\s*[:\-–]\s*(.*?)(?=\n\s*(?:[#*>_`-]+\s*\w|##|###|\*\*|$))",
+    re.DOTALL | re.IGNORECASE,
+)
+_STAGE4_BULLET_RE = re.compile(r"(?:^|\n)\s*(?:[-*•‣—–]|\d+[.)])\s+", re.MULTILINE)
+_CHECKPOINT_RE = re.compile(r"^\s*(?:[#*>_`-]*\s*)?Functional\s+Checkpoint\s*[:\-–]\s*.+", re.MULTILINE | re.IGNORECASE)
+_DECLARE_RE = re.compile(r"^\s*(?:[#*>_`-]*\s*)?Declare\s+Completion\s*[:\-–]\s*.+", re.MULTILINE | re.IGNORECASE)
+
+@lru_cache(maxsize=_EXIT_RULE_CACHE_SIZE)
 def check_stage4_exit_rule(ai_response: str) -> tuple[bool, str]:
     """Robust validation for Stage 4 Prototype Planning Package.
 
@@ -300,25 +409,20 @@ def check_stage4_exit_rule(ai_response: str) -> tuple[bool, str]:
     """
     # Normalize line breaks and strip common markdown emphasis for stable matching
     plain = ai_response.replace("\r\n", "\n")
-    plain = re.sub(r"[*_]{1,2}(.*?)?[*_]{1,2}", r"\1", plain)
+    plain = _STAGE4_EMPHASIS_RE.sub(r"\1", plain)
 
     # 1. Prototype Goal
-    goal = re.search(r"^\s*(?:[#*>_`-]*\s*)?Prototype\s+Goal\s*[:\-–]\s*.+", plain, re.MULTILINE | re.IGNORECASE)
+    goal = _GOAL_RE.search(plain)
 
     # 2. Won't Build List – capture block until next header or EOF
-    wont_match = re.search(
-        r"Won't\s+Build\s+List\s*[:\-–]\s*(.*?)(?=\n\s*(?:[#*>_`-]+\s*\w|##|###|\*\*|$))",
-        plain,
-        re.DOTALL | re.IGNORECASE,
-    )
-    bullet_pattern = re.compile(r"(?:^|\n)\s*(?:[-*•‣—–]|\d+[.)])\s+", re.MULTILINE)
-    wont_bullets = bullet_pattern.findall(wont_match.group(1)) if wont_match else []
+    wont_match = _WONT_BUILD_RE.search(plain)
+    wont_bullets = _STAGE4_BULLET_RE.findall(wont_match.group(1)) if wont_match else []
 
     # 3. Functional Checkpoint
-    checkpoint = re.search(r"^\s*(?:[#*>_`-]*\s*)?Functional\s+Checkpoint\s*[:\-–]\s*.+", plain, re.MULTILINE | re.IGNORECASE)
+    checkpoint = _CHECKPOINT_RE.search(plain)
 
     # 4. Declare Completion
-    declare = re.search(r"^\s*(?:[#*>_`-]*\s*)?Declare\s+Completion\s*[:\-–]\s*.+", plain, re.MULTILINE | re.IGNORECASE)
+    declare = _DECLARE_RE.search(plain)
 
     if goal and checkpoint and declare and len(wont_bullets) >= 1:
         return True, "✅ Stage 4 Exit Rule Met – Prototype plan ready."
@@ -335,6 +439,61 @@ def check_stage4_exit_rule(ai_response: str) -> tuple[bool, str]:
     return False, f"❌ Stage 4 Exit Rule Not Met – missing: {', '.join(missing)}."
 
 # ── Enhanced Meta-Mode Validation Function ───────────────────────────────────
+# Sections with flexible header patterns. A section runs from its header to the
+# next section's header (or the end); that end is found with a plain search
+# rather than a lazy DOTALL ".*?" that re-tests the lookahead at every character.
+_META_SECTIONS = tuple(
+    (name, re.compile(header, re.IGNORECASE), re.compile(end, re.IGNORECASE), short_name)
+    for name, header, end, short_name in (
+        ("Framework Performance Analysis",
+         r"A\.\s*\*{0,2}Framework Performance Analysis\*{0,2}|#{1,3}\s*A\.?\s*Framework Performance Analysis",
+         r"\n(?:B\.|###\s*B)",
+         "framework analysis"),
+        ("Internal Logic Reflection",
+         r"B\.\s*\*{0,2}Internal Logic Reflection\*{0,2}|#{1,3}\s*B\.?\s*Internal Logic Reflection",
+         r"\n(?:C\.|###\s*C)",
+         "logic reflection"),
+        ("Actionable Framework Refinements",
+         r"C\.\s*\*{0,2}Actionable Framework Refinements\*{0,2}|#{1,3}\s*C\.?\s*Actionable Framework Refinements",
+         r"\n(?:D\.|###\s*D)",
+         "refinements"),
+        ("Micro-Action",
+         r"D\.\s*\*{0,2}Micro-Action for Immediate Integration\*{0,2}|#{1,3}\s*D\.?\s*Micro-Action for Immediate Integration",
+         r"\n###",
+         "micro-action"),
+    )
+)
+
+def _section_block(text: str, header: re.Pattern, end: re.Pattern) -> str | None:
+    """Return a section from its header up to the next section's header, or None."""
+    match = header.search(text)
+    if match is None:
+        return None
+    stop = len(text) - 1 if text.endswith("\n") else len(text)  # where "$" would stop
+    following = end.search(text, match.end(), stop)
+    return text[match.start():following.start() if following else stop]
+
+# Additional checks for key Meta-Mode concepts
+# One zero-width alternation scanned once (so a match never swallows the start
+# of another concept); each named group sets its concept's bit
+_META_CONCEPTS_RE = re.compile(
+    r"(?=(?P<pathways>synthesize|gaps|wildcard|pathways?)"
+    r"|(?P<refinements>recommend|improvements?|concrete)"
+    r"|(?P<micro_action>≤\d+.?min|micro.?action|\d+.?min))",
+    re.IGNORECASE,
+)
+_META_CONCEPT_BITS = {"pathways": 1, "refinements": 2, "micro_action": 4}
+_ALL_META_CONCEPTS = 7
+
+def _meta_concepts(text: str) -> list[str]:
+    """Return the key concepts present in ``text``, stopping once all are seen."""
+    mask = 0
+    for match in _META_CONCEPTS_RE.finditer(text):
+        mask |= _META_CONCEPT_BITS[match.lastgroup]
+        if mask == _ALL_META_CONCEPTS:
+            break
+    return [concept for concept, bit in _META_CONCEPT_BITS.items() if mask & bit]
+
 def check_stage5_exit_rule(ai_response: str) -> tuple[bool, str]:
     """
     Enhanced Meta-Mode validation that focuses on content presence rather than strict formatting.
@@ -344,30 +503,13 @@ def check_stage5_exit_rule(ai_response: str) -> tuple[bool, str]:
     - Nested content under headers
     - Flexible spacing/punctuation
     """
-    # Define sections with more flexible patterns that capture content blocks
-    sections = [
-        ("Framework Performance Analysis", 
-         r"(?:A\.\s*\*{0,2}Framework Performance Analysis\*{0,2}|#{1,3}\s*A\.?\s*Framework Performance Analysis).*?(?=\n(?:B\.|###\s*B)|$)",
-         "framework analysis"),
-        ("Internal Logic Reflection",
-         r"(?:B\.\s*\*{0,2}Internal Logic Reflection\*{0,2}|#{1,3}\s*B\.?\s*Internal Logic Reflection).*?(?=\n(?:C\.|###\s*C)|$)",
-         "logic reflection"),
-        ("Actionable Framework Refinements",
-         r"(?:C\.\s*\*{0,2}Actionable Framework Refinements\*{0,2}|#{1,3}\s*C\.?\s*Actionable Framework Refinements).*?(?=\n(?:D\.|###\s*D)|$)",
-         "refinements"),
-        ("Micro-Action",
-         r"(?:D\.\s*\*{0,2}Micro-Action for Immediate Integration\*{0,2}|#{1,3}\s*D\.?\s*Micro-Action for Immediate Integration).*?(?=\n###|$)",
-         "micro-action")
-    ]
-    
     found_sections = []
     missing_sections = []
     content_analysis = []
     
-    for name, pattern, short_name in sections:
-        match = re.search(pattern, ai_response, re.IGNORECASE | re.DOTALL)
-        if match:
-            content = match.group(0)
+    for name, header, end, short_name in _META_SECTIONS:
+        content = _section_block(ai_response, header, end)
+        if content is not None:
             content_length = len(content.strip())
             
             # Check if section has meaningful content (more than just the header)
@@ -385,24 +527,13 @@ def check_stage5_exit_rule(ai_response: str) -> tuple[bool, str]:
             content_analysis.append(f"❌ {short_name}: header not found")
     
     # Enhanced debug output
-    print(f"🔍 Meta-Mode Validation Debug:")
-    print(f"- Sections found: {len(found_sections)}/4")
-    for analysis in content_analysis:
-        print(f"  {analysis}")
-    
-    # Additional checks for key Meta-Mode concepts
-    key_concepts = {
-        "pathways": r"(?:synthesize|gaps|wildcard|pathways?)",
-        "refinements": r"(?:recommend|improvements?|concrete)",
-        "micro_action": r"(?:≤\d+.?min|micro.?action|\d+.?min)"
-    }
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("🔍 Meta-Mode Validation Debug:\n- Sections found: %d/4\n%s",
+                  len(found_sections), "\n".join([f"  {analysis}" for analysis in content_analysis]))
     
-    concept_found = []
-    for concept, pattern in key_concepts.items():
-        if re.search(pattern, ai_response, re.IGNORECASE):
-            concept_found.append(concept)
+    concept_found = _meta_concepts(ai_response)
     
-    print(f"- Key concepts found: {concept_found}")
+    log.debug("- Key concepts found: %s", concept_found)
     
     if len(found_sections) == 4:
         return (True, f"✅ Meta-Mode Exit Rule Met – all sections addressed with sufficient content.")
@@ -410,11 +541,9 @@ def check_stage5_exit_rule(ai_response: str) -> tuple[bool, str]:
         return (False, f"❌ Meta-Mode Exit Rule Not Met – issues: {', '.join(missing_sections)}.")
 
 # Alternative simpler version (kept as reference but not used by default)
-def check_stage5_exit_rule_simple(ai_response: str) -> tuple[bool, str]:
-    """
-    Simplified Meta-Mode validation that looks for key content indicators.
-    """
-    required_elements = {
+_META_ELEMENTS = {
+    element_name: tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+    for element_name, patterns in {
         "Framework Analysis": [
             r"framework.*performance",
             r"recent.*interactions?",
@@ -432,27 +561,59 @@ def check_stage5_exit_rule_simple(ai_response: str) -> tuple[bool, str]:
             r"(?:≤\d+.?min|\d+.?min|micro.?action)",
             r"(?:test|task)"
         ]
-    }
-    
+    }.items()
+}
+
+def check_stage5_exit_rule_simple(ai_response: str) -> tuple[bool, str]:
+    """
+    Simplified Meta-Mode validation that looks for key content indicators.
+    """
     found_elements = []
     missing_elements = []
     
-    for element_name, patterns in required_elements.items():
-        element_found = any(re.search(pattern, ai_response, re.IGNORECASE) for pattern in patterns)
+    for element_name, patterns in _META_ELEMENTS.items():
+        element_found = any(pattern.search(ai_response) for pattern in patterns)
         if element_found:
             found_elements.append(element_name)
         else:
             missing_elements.append(element_name)
     
-    print(f"🔍 Simple Meta-Mode Validation:")
-    print(f"- Elements found: {found_elements}")
-    print(f"- Elements missing: {missing_elements}")
+    log.debug("🔍 Simple Meta-Mode Validation:\n- Elements found: %s\n- Elements missing: %s",
+              found_elements, missing_elements)
     
     if len(found_elements) >= 3:  # Allow some flexibility
         return (True, f"✅ Meta-Mode Exit Rule Met – {len(found_elements)}/4 key elements present.")
     else:
         return (False, f"❌ Meta-Mode Exit Rule Not Met – only {len(found_elements)}/4 elements found.")
 
+# Stage -> (exit rule checker, note when met, note when not met). Every checker
+# is called as checker(ai_response, user_prompt, prompt_lower); only stage 3
+# reads the prompt, so the others are wrapped to drop it.
+_STAGE_DISPATCH = {
+    '0': (lambda ai, up, low: check_stage0_exit_rule(ai),
+          "\n🎉 Context seeded. Suggest advancing to Stage 1 (Brain Dump).",
+          "\n[AI NOTE] Clarify 'Success Today' and 'Primary Constraint'."),
+    '1': (lambda ai, up, low: check_stage1_exit_rule(ai),
+          "\n🎉 Suggest advancing to Stage 2.",
+          "\n[AI NOTE] Improve theme identification."),
+    '2': (lambda ai, up, low: check_stage2_exit_rule(ai),
+          "\n🎉 Mind-Trace complete. Advance to Stage 3 (Signal Scan).",
+          "\n[AI NOTE] Improve pattern documentation and emotional transition guidance."),
+    '3': (check_stage3_exit_rule,
+          "\n🎉 Signal Scan complete (constraints respected).",
+          "\n[AI NOTE] Review constraint violations."),
+    '4': (lambda ai, up, low: check_stage4_exit_rule(ai),
+          "\n🎉 Prototype plan valid. Start building & test!",
+          "\n[AI NOTE] Complete missing Stage 4 sections."),
+    'meta': (lambda ai, up, low: check_stage5_exit_rule(ai),
+             "\n🧠 Meta-Mode reflection logged. Resume previous stage when ready.",
+             "\n[AI NOTE] Improve Meta-Mode section coverage."),
+}
+
+# Turn banner pieces, each emitted with a single stdout write
+_BAR = "=" * 50
+_RESPONSE_HEADER = f"\n{_BAR}\n{'🤖 AI RESPONSE'.center(50)}\n{_BAR}\n"
+
 # ── Rubric Definitions ──────────────────────────────────────────────────────
 RUBRIC = [
     ("clarity", "Is the answer clear and understandable?"),
@@ -471,6 +632,14 @@ META_RUBRIC = [
     ("transitional_neutrality", "Does the response effectively validate neutrality as a productive transitional state?")
 ]
 
+# Judge system prompts and score keys depend only on the rubrics, so they are
+# built once here rather than on every self_eval call
+_JSON_REPLY_HINT = "\n\nReturn ONLY json: {\"scores\": {...}, \"patch_note\": \"...\"}"
+_RUBRIC_PROMPT = "Standard Evaluation:\n" + "\n".join(f"- {k}: {v}" for k, v in RUBRIC) + _JSON_REPLY_HINT
+_META_RUBRIC_PROMPT = "Meta-Mode Evaluation:\n" + "\n".join(f"- {k}: {v}" for k, v in META_RUBRIC) + _JSON_REPLY_HINT
+_RUBRIC_KEYS = frozenset(k for k, _ in RUBRIC)
+_META_RUBRIC_KEYS = frozenset(k for k, _ in META_RUBRIC)
+
 # ── New MICRO_GOAL_TEMPLATES (add near RUBRIC definitions) ────────────────────
 MICRO_GOAL_TEMPLATES = {
     "wildcard": "Spend 15 min finding one analogy from {domain} (e.g., '{example}')",
@@ -478,16 +647,18 @@ MICRO_GOAL_TEMPLATES = {
 }
 
 # ── Database Setup ───────────────────────────────────────────────────────────
+# Append-only telemetry: row order is never relied on (reads ORDER BY timestamp)
+# and checkpointing less often keeps the WAL off the per-turn write path.
+_DB_CONFIG = {
+    "threads": str(os.cpu_count() or 4),
+    "preserve_insertion_order": "false",
+    "checkpoint_threshold": "1GB",
+}
+
 def init_database():
     """Initialize database with error handling and schema migration."""
     try:
-        conn = duckdb.connect(str(DB_PATH))
-        
-        # Check if is_meta column exists
-        meta_exists = conn.execute("""
-            SELECT COUNT(*) FROM information_schema.columns 
-            WHERE table_name = 'interactions' AND column_name = 'is_meta'
-        """).fetchone()[0] > 0
+        conn = duckdb.connect(str(DB_PATH), config=_DB_CONFIG)
         
         # Create table if not exists with latest schema
         conn.execute("""
@@ -502,127 +673,374 @@ def init_database():
             is_meta BOOLEAN DEFAULT FALSE
         );
         """)
+
+        # Judge results keyed by a SHA-256 of the evaluated exchange
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS eval_cache (
+            h BLOB PRIMARY KEY,
+            scores JSON,
+            patch_note TEXT
+        );
+        """)
         
-        # Add column if it doesn't exist
-        if not meta_exists:
-            conn.execute("ALTER TABLE interactions ADD COLUMN is_meta BOOLEAN DEFAULT FALSE")
-            print("🔧 Database schema migrated to v0.7 (added is_meta column)")
-            
+        # Migrate pre-v0.7 databases (no is_meta column) in one statement
+        conn.execute("ALTER TABLE interactions ADD COLUMN IF NOT EXISTS is_meta BOOLEAN DEFAULT FALSE")
+
         return conn
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
         raise
 
-CONN = init_database()
+CONN: duckdb.DuckDBPyConnection | None = None
+
+def get_conn() -> duckdb.DuckDBPyConnection:
+    """Return the shared database connection, opening it on first use.
+
+    Importing the module (e.g. just for the exit-rule checks) no longer pays
+    for opening the database file and replaying its WAL.
+    """
+    global CONN
+    if CONN is None:
+        CONN = init_database()
+    return CONN
 
 # ── LLM Communication ────────────────────────────────────────────────────────
-def chat(messages: list[dict], *, force_json: bool = False) -> str:
-    """Send request to DeepSeek with enhanced debugging."""
+_CLIENT: "OpenAI | None" = None
+_JSON_MODE = {"response_format": {"type": "json_object"}}
+
+def get_client() -> "OpenAI":
+    """Return the shared DeepSeek client, creating it on first use.
+
+    Reusing one client keeps its HTTP connection pool (and TLS sessions)
+    alive across calls instead of rebuilding it per request.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        import openai
+
+        # Older openai releases lack the Default*Client transports; use the SDK default then
+        transport = getattr(openai, "DefaultHttpxClient", None)
+        _CLIENT = openai.OpenAI(
+            api_key=DEEPSEEK_API_KEY,
+            base_url=DEEPSEEK_BASE_URL,
+            http_client=transport(http2=_HTTP2) if transport is not None else None,
+        )
+    return _CLIENT
+
+def chat(messages: list[dict], *, force_json: bool = False, stream: bool = False) -> str:
+    """Send request to DeepSeek with enhanced debugging.
+
+    With ``stream=True`` the reply is echoed to stdout as it arrives, so the
+    user sees the first tokens immediately; the full text is still returned.
+    """
     try:
-        client = OpenAI(api_key=DEEPSEEK_API_KEY, base_url=DEEPSEEK_BASE_URL)
-        kwargs = {"response_format": {"type": "json_object"}} if force_json else {}
+        client = get_client()
+        kwargs = _JSON_MODE if force_json else {}
+        if stream:
+            kwargs = {**kwargs, "stream": True}
         
-        print(f"🤖 Sending {'JSON-' if force_json else ''}request to {MODEL}...")
+        log.debug("🤖 Sending %srequest to %s...", "JSON-" if force_json else "", MODEL)
         resp = client.chat.completions.create(
             model=MODEL,
             messages=messages,
             temperature=0.7,
             **kwargs
         )
-        result = resp.choices[0].message.content.strip()
-        print(f"✅ Received {len(result)} chars")
+        if stream:
+            parts = []
+            for chunk in resp:
+                piece = chunk.choices[0].delta.content if chunk.choices else None
+                if piece:
+                    parts.append(piece)
+                    sys.stdout.write(piece)
+                    sys.stdout.flush()
+            sys.stdout.write("\n")
+            result = "".join(parts).strip()
+        else:
+            result = resp.choices[0].message.content.strip()
+        log.debug("✅ Received %d chars", len(result))
         return result
     except Exception as e:
         print(f"❌ API call failed: {type(e).__name__}: {e}")
         raise
 
+def _async_http_client():
+    """Async transport for a batch client: aiohttp if usable, else pooled httpx, else the SDK default."""
+    import openai
+
+    aiohttp_transport = getattr(openai, "DefaultAioHttpClient", None)
+    if _AIOHTTP and aiohttp_transport is not None:
+        try:
+            return aiohttp_transport()
+        except (ImportError, RuntimeError):
+            log.warning("aiohttp transport unavailable; using httpx")
+    httpx_transport = getattr(openai, "DefaultAsyncHttpxClient", None)
+    if httpx_transport is not None:
+        return httpx_transport(http2=_HTTP2)
+    return None
+
+def new_async_client() -> "AsyncOpenAI":
+    """Build an async DeepSeek client.
+
+    Its connection pool is bound to the event loop that first uses it, so
+    unlike the sync client it is not cached: each batch run opens its own and
+    closes it before the loop ends (see `_bounded_gather`).
+    """
+    import openai
+
+    return openai.AsyncOpenAI(
+        api_key=DEEPSEEK_API_KEY,
+        base_url=DEEPSEEK_BASE_URL,
+        http_client=_async_http_client(),
+    )
+
+async def achat(client: "AsyncOpenAI", messages: list[dict], *, force_json: bool = False) -> str:
+    """Async counterpart of `chat` so independent requests can overlap."""
+    try:
+        kwargs = _JSON_MODE if force_json else {}
+        resp = await client.chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            temperature=0.7,
+            **kwargs
+        )
+        return resp.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"❌ API call failed: {type(e).__name__}: {e}")
+        raise
+
 # ── Self-Evaluation ──────────────────────────────────────────────────────────
+def _strip_fences(s: str) -> str:
+    """Slice a leading ```/```json line and a trailing ``` off a reply (fences only wrap it)."""
+    s = s.strip()
+    if s.startswith("```"):
+        newline = s.find("\n")
+        if newline == -1:
+            s = s[3:]
+            if s[:4].lower() == "json":
+                s = s[4:]
+        elif s[3:newline].strip().lower() in ("", "json"):
+            s = s[newline + 1:]
+    if s.endswith("```"):
+        s = s[:-3]
+    return s.strip()
+
+_JSON_DECODER = json.JSONDecoder()
+
 def extract_json_response(raw: str) -> dict:
     """
-    Robust JSON extractor with:
-    1. Markdown fence removal
-    2. JSON object extraction
-    3. Multiple fallback strategies
+    Robust JSON extractor: strip Markdown fences, try a direct parse, then
+    decode the first JSON object in the text (trailing prose is ignored).
     """
-    strategies = [
-        lambda s: json.loads(s),  # Try direct parse first
-        lambda s: json.loads(re.sub(r'^```(json)?|```$', '', s, flags=re.MULTILINE).strip()),
-        lambda s: json.loads(s[s.find('{'):s.rfind('}')+1])
-    ]
-    
-    last_error = None
-    for strategy in strategies:
-        try:
-            return strategy(raw)
-        except (json.JSONDecodeError, ValueError, AttributeError) as e:
-            last_error = e
-            continue
-    
-    raise last_error or ValueError("No valid JSON found in response")
-
-def self_eval(stage: str, user_prompt: str, ai_response: str, is_meta: bool = False) -> tuple[dict, str]:
-    # Initialize all variables with defaults
-    scores = {}
-    patch_note = ""
-    raw = ""
-    data = {}
-
+    s = _strip_fences(raw)
+    try:
+        return _json_loads(s)
+    except ValueError:
+        pass
+    start = s.find('{')
+    if start < 0:
+        raise ValueError("No JSON object found in response")
+    # raw_decode stops at the object's closing brace: one parse, no re-slicing
+    return _JSON_DECODER.raw_decode(s, start)[0]
+
+def _eval_messages(stage: str, user_prompt: str, ai_response: str, is_meta: bool) -> tuple[frozenset, list[dict]]:
+    """Build the rubric keys and judge messages for a self-evaluation request."""
     # Choose rubric based on meta_flag
     if is_meta:
-        rubric = META_RUBRIC
-        rubric_str = "Meta-Mode Evaluation:\n" + "\n".join(f"- {k}: {v}" for k, v in META_RUBRIC)
+        rubric_keys, rubric_str = _META_RUBRIC_KEYS, _META_RUBRIC_PROMPT
     else:
-        rubric = RUBRIC
-        rubric_str = "Standard Evaluation:\n" + "\n".join(f"- {k}: {v}" for k, v in RUBRIC)
-    
-    rubric_str += "\n\nReturn ONLY json: {\"scores\": {...}, \"patch_note\": \"...\"}"
+        rubric_keys, rubric_str = _RUBRIC_KEYS, _RUBRIC_PROMPT
 
     messages = [
         {"role": "system", "content": rubric_str},
         {"role": "user", "content": f"Stage: {stage}\nMeta-Mode: {is_meta}\nUser: {user_prompt}\nAI: {ai_response}"}
     ]
+    return rubric_keys, messages
+
+# robust_json_parser strategies that read the judge's JSON as written; the
+# others scrape or invent scores, so their results are never cached
+_CLEAN_PARSES = frozenset({"direct_json", "markdown_cleanup", "json_extraction"})
+
+def _parse_eval(raw: str, rubric_keys: frozenset) -> tuple[dict, str, bool]:
+    """Parse the judge's raw reply into (scores, patch_note, clean); raises on bad JSON.
+
+    ``clean`` is True when the reply was read as JSON and scored every rubric key.
+    """
+    log.debug("📊 Raw response start: %.120s...", raw)
+
+    # Step 2: Parse JSON response
+    clean = True
+    if _IMPROVED:
+        parse_result = _IMPROVED.robust_json_parser(raw)
+        data = parse_result.data
+        clean = parse_result.method_used in _CLEAN_PARSES
+        log.debug("🧹 Parsed with %s (confidence: %.2f)", parse_result.method_used, parse_result.confidence)
+    else:
+        data = extract_json_response(raw)
+    
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("🧹 Parsed JSON keys: %s", list(data.keys()))
+
+    # Step 3: Validate required fields
+    if not isinstance(data, dict):
+        raise ValueError("Response is not a valid JSON object")
+    
+    scores = data.get("scores", {})
+    patch_note = data.get("patch_note", "")
+
+    # Step 4: Validate rubric scores (one set difference against the dict's key view)
+    missing = rubric_keys - scores.keys()
+    if missing:
+        print(f"⚠️ Missing some rubric scores: {', '.join(sorted(missing))}")
+        clean = False
+
+    return scores, patch_note, clean
+
+def _eval_fallback(error: Exception, raw: str, stage: str, ai_response: str, is_meta: bool) -> tuple[dict, str]:
+    """Log an evaluation failure and degrade to heuristic (or empty) scores."""
+    print(f"❌ Evaluation error: {error}")
+    log.debug("🛠️ Debug info:\n- Raw start: %.200s", raw or "No raw response")
+    if _IMPROVED is not None:
+        # Fall back to heuristic estimation so downstream code always
+        # receives a well-formed `scores` dict and `patch_note` string.
+        print("🔄 Falling back to heuristic evaluation …")
+        return _IMPROVED.heuristic_evaluation(stage, ai_response, is_meta)
+    print("⚠️ ImprovedFramework not available; returning empty scores.")
+    return {}, ""
+
+def _eval_key(stage: str, user_prompt: str, ai_response: str, is_meta: bool) -> bytes:
+    """Cache key for a judged exchange.
+
+    The judge model and the rubric prompt chosen by is_meta are hashed in too,
+    so changing either re-judges instead of serving stale scores.
+    """
+    rubric_str = _META_RUBRIC_PROMPT if is_meta else _RUBRIC_PROMPT
+    return hashlib.sha256(
+        f"{MODEL}\x00{rubric_str}\x00{stage}\x00{is_meta}\x00{user_prompt}\x00{ai_response}".encode()
+    ).digest()
+
+def _cached_eval(key: bytes) -> tuple[dict, str] | None:
+    """Return a previously stored judge result, if any."""
+    row = get_conn().execute("SELECT scores, patch_note FROM eval_cache WHERE h = ?", [key]).fetchone()
+    if row is None:
+        return None
+    log.debug("♻️ Self-evaluation served from cache")
+    return _json_loads(row[0]), row[1]
+
+def _store_eval(key: bytes, parsed: tuple[dict, str, bool]) -> tuple[dict, str]:
+    """Remember a cleanly parsed judge result and pass (scores, patch_note) through.
+
+    Scraped or incomplete results are not kept, so the next run asks the judge again.
+    """
+    scores, patch_note, clean = parsed
+    if clean:
+        get_conn().execute("INSERT OR REPLACE INTO eval_cache VALUES (?, ?, ?)", [key, _json_dumps(scores), patch_note])
+    return scores, patch_note
+
+def self_eval(stage: str, user_prompt: str, ai_response: str, is_meta: bool = False) -> tuple[dict, str]:
+    key = _eval_key(stage, user_prompt, ai_response, is_meta)
+    rubric_keys, messages = _eval_messages(stage, user_prompt, ai_response, is_meta)
+    raw = ""
 
-    print("\n🔍 Starting self-evaluation with robust parsing...")
+    log.debug("🔍 Starting self-evaluation with robust parsing...")
     
     try:
+        cached = _cached_eval(key)
+        if cached is not None:
+            return cached
+
         # Step 1: Get raw response from chat
         raw = chat(messages, force_json=True)
-        print(f"📊 Raw response start: {raw[:120]}...")
+        return _store_eval(key, _parse_eval(raw, rubric_keys))
+    except (json.JSONDecodeError, Exception) as e:
+        # Consolidated handler: log and gracefully degrade.
+        return _eval_fallback(e, raw, stage, ai_response, is_meta)
+
+async def aself_eval(
+    client: "AsyncOpenAI", stage: str, user_prompt: str, ai_response: str, is_meta: bool = False
+) -> tuple[dict, str]:
+    """Async counterpart of `self_eval` built on `achat`."""
+    key = _eval_key(stage, user_prompt, ai_response, is_meta)
+    rubric_keys, messages = _eval_messages(stage, user_prompt, ai_response, is_meta)
+    raw = ""
+    try:
+        cached = _cached_eval(key)
+        if cached is not None:
+            return cached
 
-        # Step 2: Parse JSON response
-        if _IMPROVED:
-            parse_result = _IMPROVED.robust_json_parser(raw)
-            data = parse_result.data
-            print(f"🧹 Parsed with {parse_result.method_used} (confidence: {parse_result.confidence:.2f})")
-        else:
-            data = extract_json_response(raw)
-        
-        print(f"🧹 Parsed JSON keys: {list(data.keys())}")
+        raw = await achat(client, messages, force_json=True)
+        return _store_eval(key, _parse_eval(raw, rubric_keys))
+    except (json.JSONDecodeError, Exception) as e:
+        return _eval_fallback(e, raw, stage, ai_response, is_meta)
+
+# Columnar bulk insert: one list parameter per column, unnested server-side.
+# This is the Appender-style path without a pandas/pyarrow dependency and
+# roughly twice as fast as executemany's per-row INSERTs.
+_INSERT_SQL = "INSERT INTO interactions SELECT " + ", ".join(["unnest(?)"] * 8)
+_FLUSH_EVERY = 32               # rows buffered before a batched insert
+_FLUSH_INTERVAL = 5.0           # ...or seconds since the last write, whichever comes first
+_PENDING: list[tuple] = []
+_LAST_FLUSH = time.monotonic()
+
+def flush_interactions() -> None:
+    """Write buffered interactions to the database in one batch.
+
+    The buffer is swapped out before the insert, so a batch that fails is
+    logged and dropped rather than retried (and failing again) on every
+    later save and at exit.
+    """
+    global _PENDING, _LAST_FLUSH
+    rows, _PENDING = _PENDING, []
+    if rows:
+        try:
+            get_conn().execute(_INSERT_SQL, [list(column) for column in zip(*rows)])
+        except duckdb.Error as e:
+            log.error("❌ Dropped %d buffered interactions: %s", len(rows), e)
+    _LAST_FLUSH = time.monotonic()
 
-        # Step 3: Validate required fields
-        if not isinstance(data, dict):
-            raise ValueError("Response is not a valid JSON object")
-        
-        scores = data.get("scores", {})
-        patch_note = data.get("patch_note", "")
+atexit.register(flush_interactions)
 
-        # Step 4: Validate rubric scores
-        if not all(k in scores for k, _ in rubric):
-            print("⚠️ Missing some rubric scores")
+# Newest-last (stage, user_prompt, ai_response) tail for Meta-Mode, so the
+# last-N lookup is a list slice instead of a sort over the whole table.
+_RECENT_SIZE = 16
+_RECENT: deque = deque(maxlen=_RECENT_SIZE)
+_RECENT_LOADED = False
 
-    except (json.JSONDecodeError, Exception) as e:
-        # Consolidated handler: log and gracefully degrade.
-        print(f"❌ Evaluation error: {e}")
-        print(f"🛠️ Debug info:\n- Raw start: {raw[:200] if raw else 'No raw response'}")
-        if _IMPROVED is not None:
-            # Fall back to heuristic estimation so downstream code always
-            # receives a well-formed `scores` dict and `patch_note` string.
-            print("🔄 Falling back to heuristic evaluation …")
-            scores, patch_note = _IMPROVED.heuristic_evaluation(stage, ai_response, is_meta)
-        else:
-            print("⚠️ ImprovedFramework not available; returning empty scores.")
+def recent_interactions(n: int = 3) -> list[tuple]:
+    """Return the ``n`` most recent interactions, newest first.
 
-    return scores, patch_note
+    The first call seeds the in-memory tail from the database; later calls
+    (and saves) keep it current without touching DuckDB.
+    """
+    global _RECENT_LOADED
+    if not _RECENT_LOADED:
+        flush_interactions()
+        rows = get_conn().cursor().execute(
+            "SELECT stage, user_prompt, ai_response FROM interactions "
+            "ORDER BY timestamp DESC LIMIT ?",
+            [_RECENT_SIZE],
+        ).fetchall()
+        _RECENT.clear()
+        _RECENT.extend(reversed(rows))
+        _RECENT_LOADED = True
+    return list(_RECENT)[:-n - 1:-1] if n > 0 else []
+
+def _uuid7() -> str:
+    """Return a time-ordered UUIDv7 (RFC 9562) string.
+
+    The 48-bit millisecond prefix keeps ids roughly insertion-ordered (tighter
+    min-max zonemaps on the key) and the random bits come from ``random``
+    rather than an ``os.urandom`` syscall per row.
+    """
+    rand = random.getrandbits(74)
+    value = (
+        (time.time_ns() // 1_000_000) << 80
+        | 0x7 << 76                         # version
+        | (rand >> 62) << 64                # rand_a (12 bits)
+        | 0b10 << 62                        # variant
+        | rand & ((1 << 62) - 1)            # rand_b (62 bits)
+    )
+    return str(uuid.UUID(int=value))
 
 def save_interaction(
     stage: str,
@@ -632,30 +1050,52 @@ def save_interaction(
     patch_note: str,
     is_meta: bool = False
 ) -> None:
-    """Save interaction to database."""
-    CONN.execute(
-        "INSERT INTO interactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    """Buffer interaction for a batched database write."""
+    _PENDING.append(
         (
-            str(uuid.uuid4()),
-            time.strftime("%Y-%m-%d %H:%M:%S"),
+            _uuid7(),
+            datetime.now(),
             stage,
             user_prompt,
             ai_response,
-            json.dumps(scores, ensure_ascii=False),
+            _json_dumps(scores),
             patch_note,
             is_meta
-        ),
+        )
+    )
+    _RECENT.append((stage, user_prompt, ai_response))
+    if len(_PENDING) >= _FLUSH_EVERY or time.monotonic() - _LAST_FLUSH >= _FLUSH_INTERVAL:
+        flush_interactions()
+
+def export_interactions(path: str | Path = "self_evo_logs") -> Path:
+    """Snapshot interactions to a Parquet dataset partitioned by date and stage.
+
+    Analytics can read it with ``read_parquet('<path>/**/*.parquet',
+    hive_partitioning=1, hive_types_autocast=0)`` (the latter keeps stage as
+    text) and only touch the partitions and columns they need, instead of
+    scanning the prompt and response text in the live database.
+    """
+    flush_interactions()
+    target = Path(path).resolve()
+    quoted = str(target).replace("'", "''")
+    get_conn().execute(
+        "COPY (SELECT *, CAST(timestamp AS DATE) AS date FROM interactions) "
+        f"TO '{quoted}' (FORMAT PARQUET, PARTITION_BY (date, stage), OVERWRITE_OR_IGNORE)"
     )
+    return target
 
 # ── 2. Trigger Detection ───────────────────────────────
+# One alternation so the prompt is scanned once for every trigger
+_META_MODE_RE = re.compile(
+    r"meta[\-\s]?mode"                            # explicit meta keyword
+    r"|\bzoom\s*out\b"                            # user asks to zoom out
+    r"|\bhow\s+(?:did|do)\s+you\s+(?:decide|arrive|choose)\b"  # asks about AI reasoning
+    r"|\bcurious\s+about\s+(?:the\s+)?process\b",  # explicit curiosity about framework
+    re.I
+)
+
 def is_meta_mode(prompt: str) -> bool:
-    patterns = [
-        r"meta[\-\s]?mode",                          # explicit meta keyword
-        r"\bzoom\s*out\b",                            # user asks to zoom out
-        r"\bhow\s+(?:did|do)\s+you\s+(?:decide|arrive|choose)\b",  # asks about AI reasoning
-        r"\bcurious\s+about\s+(?:the\s+)?process\b"   # explicit curiosity about framework
-    ]
-    return any(re.search(p, prompt, re.I) for p in patterns)
+    return _META_MODE_RE.search(prompt) is not None
 
 # ── 3. Meta-Response Generator ─────────────────────────
 def generate_meta_response(user_prompt: str, convo_hist: list[str]) -> str:
@@ -663,9 +1103,7 @@ def generate_meta_response(user_prompt: str, convo_hist: list[str]) -> str:
     Generates a Meta-Mode response aligned with the new template.
     """
     # Analyze recent interactions (simplified example)
-    recent_stages = CONN.execute(
-        "SELECT stage, user_prompt, ai_response FROM interactions ORDER BY timestamp DESC LIMIT 3"
-    ).fetchall()
+    recent_stages = recent_interactions(3)
     
     # Toy analysis (replace with real logic)
     patterns = {
@@ -699,95 +1137,152 @@ def generate_meta_response(user_prompt: str, convo_hist: list[str]) -> str:
     return f"{response}\n\n**Micro-Actions**:\n{', '.join(micro_goals)}"
 
 # ── Helper Functions ─────────────────────────────────────────────────
-def is_meta_reflection(prompt: str) -> bool:
+def is_meta_reflection(prompt: str, prompt_lower: str | None = None) -> bool:
     """Detects if a prompt is requesting meta-mode reflection."""
-    return "[META" in prompt.upper()
+    return "[meta" in (prompt.lower() if prompt_lower is None else prompt_lower)
+
+# ── Batch Execution ──────────────────────────────────────────────────────────
+async def process_prompt(client: "AsyncOpenAI", stage: str, user_prompt: str) -> tuple[str, dict, str]:
+    """Generate a stage response, self-evaluate it and buffer the result."""
+    is_meta = is_meta_reflection(user_prompt)
+    system_msg = STAGE_SYSTEM_MESSAGES['meta'] if is_meta else STAGE_SYSTEM_MESSAGES.get(stage, "Invalid stage.")
+    ai_response = await achat(client, [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": user_prompt},
+    ])
+    scores, eval_note = await aself_eval(client, stage, user_prompt, ai_response, is_meta=is_meta)
+    save_interaction(stage, user_prompt, ai_response, scores, eval_note, is_meta=is_meta)
+    return ai_response, scores, eval_note
+
+def _env_max_concurrency(name: str = "DEEPSEEK_MAX_CONCURRENCY", default: int = 5) -> int:
+    """Positive integer named by the environment variable, or ``default`` if it is not one."""
+    value = os.getenv(name, str(default))
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if limit >= 1:
+        return limit
+    log.warning("⚠️ Ignoring %s=%r (not a positive integer); using %d", name, value, default)
+    return default
+
+MAX_CONCURRENCY = _env_max_concurrency()
+
+async def _bounded_gather(calls: list, max_concurrency: int) -> list:
+    """Await ``fn(client, *args)`` for each (fn, args) pair, at most ``max_concurrency`` at once, in order.
+
+    The client lives only as long as this run's event loop, so a later
+    ``asyncio.run`` never reuses connections tied to a closed loop. A call
+    that raises leaves its exception in its slot instead of discarding the
+    rest of the batch.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    client = new_async_client()
+
+    async def _limited(fn, args):
+        async with semaphore:
+            return await fn(client, *args)
+
+    async with client:
+        return await asyncio.gather(*(_limited(fn, args) for fn, args in calls), return_exceptions=True)
+
+def run_batch(
+    items: list[tuple[str, str]],
+    max_concurrency: int = MAX_CONCURRENCY
+) -> list[tuple[str, dict, str] | Exception]:
+    """
+    Process many (stage, prompt) pairs concurrently.
+    Each request is network-bound, so overlapping them scales near-linearly;
+    a semaphore caps the prompts in flight to stay under provider rate limits.
+    A prompt whose request fails gets its exception in place of a result.
+    """
+    return asyncio.run(_bounded_gather([(process_prompt, item) for item in items], max_concurrency))
+
+def run_eval_batch(
+    exchanges: list[tuple[str, str, str, bool]],
+    max_concurrency: int = MAX_CONCURRENCY
+) -> list[tuple[dict, str] | Exception]:
+    """
+    Judge many already-generated (stage, user_prompt, ai_response, is_meta)
+    exchanges concurrently, e.g. to re-score logged interactions offline.
+    Exchanges already in eval_cache are answered without a request; one that
+    fails outright gets its exception in place of a result.
+    """
+    return asyncio.run(_bounded_gather([(aself_eval, exchange) for exchange in exchanges], max_concurrency))
+
+def _start_log_listener() -> None:
+    """Hand log records to a queue; a background thread writes them to stderr."""
+    if log.handlers:
+        return
+    records = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(records, stream)
+    log.addHandler(logging.handlers.QueueHandler(records))
+    log.propagate = False
+    listener.start()
+    atexit.register(listener.stop)
 
 # ── Main Execution ───────────────────────────────────────────────────────────
 def main():
+    _start_log_listener()
     # Initialize enhanced logger
     logger = FrameworkLogger()
     
     try:
         while True:
             # Normal framework operation
-            stage = input("Framework Stage (0-5): ").strip()
+            # Interned so _STAGE_DISPATCH and STAGE_SYSTEM_MESSAGES hits are identity compares
+            stage = sys.intern(input("Framework Stage (0-5): ").strip())
             user_prompt = read_multiline()
+            prompt_lower = user_prompt.lower()  # shared by every case-insensitive check below
             
-            meta_flag = is_meta_reflection(user_prompt)
-
-            system_msg = (
-                STAGE_SYSTEM_MESSAGES['meta']
-                if meta_flag else STAGE_SYSTEM_MESSAGES.get(stage, "Invalid stage.")
-            )
+            meta_flag = is_meta_reflection(user_prompt, prompt_lower)
 
             if not user_prompt:
                 raise ValueError("Empty prompt")
             
-            # Check for special modes
-            if check_meta_mode(user_prompt):
+            # Check for special modes (one pass classifies the prompt)
+            is_meta_query, is_overwhelmed = classify_prompt(user_prompt, prompt_lower)
+            if is_meta_query:
                 return handle_meta_query(user_prompt)
             
-            if "overwhelm" in user_prompt.lower():
+            if is_overwhelmed:
                 resize_data = handle_overwhelm(user_prompt, extract_emotion(user_prompt))
                 print(f"\n🔄 Resize Intervention: {resize_data['template']}")
                 messages = [{"role": "system", "content": resize_data['system_prompt']}]
             else:
                 messages = stage_specific_processing(stage, user_prompt)
             
+            sys.stdout.write(_RESPONSE_HEADER)
+            sys.stdout.flush()
+
             # 4. Main Loop Branch  ───────────────────────────────
             if is_meta_mode(user_prompt) or stage.lower() == 'meta':
                 ai_response = generate_meta_response(user_prompt, convo_hist=[])
+                print(ai_response)
             else:
-                # Get AI response
-                ai_response = chat(messages, force_json=True)
-            
-            print("\n" + "="*50)
-            print("🤖 AI RESPONSE".center(50))
-            print("="*50)
-            print(ai_response)
-            print("="*50)
-            print(f"\n📝 Response length: {len(ai_response)} characters")
-            print("="*50 + "\n")
+                # Get AI response, printed as it streams in
+                ai_response = chat(messages, force_json=True, stream=True)
             
+            sys.stdout.write(f"{_BAR}\n\n📝 Response length: {len(ai_response)} characters\n{_BAR}\n\n")
+            sys.stdout.flush()
+
             # Stage-specific exit rules
             patch_note = ""                # ← ensure defined for every path
             exit_rule_status_message = ""
 
-            if stage == '0':
-                is_met, msg = check_stage0_exit_rule(ai_response)
-                exit_rule_status_message = msg
-                if not is_met:
-                    patch_note = "\n[AI NOTE] Clarify 'Success Today' and 'Primary Constraint'."
-                else:
-                    patch_note = "\n🎉 Context seeded. Suggest advancing to Stage 1 (Brain Dump)."
-            elif stage == '1':
-                is_met, msg = check_stage1_exit_rule(ai_response)
-                exit_rule_status_message = msg
-                patch_note = "\n🎉 Suggest advancing to Stage 2." if is_met else "\n[AI NOTE] Improve theme identification."
-            elif stage == '2':
-                is_met, msg = check_stage2_exit_rule(ai_response)
-                exit_rule_status_message = msg
-                if is_met:
-                    patch_note = "\n🎉 Mind-Trace complete. Advance to Stage 3 (Signal Scan)."
-                else:
-                    patch_note = "\n[AI NOTE] Improve pattern documentation and emotional transition guidance."
-            elif stage == '3':
-                is_met, msg = check_stage3_exit_rule(ai_response, user_prompt)
-                exit_rule_status_message = msg
-                if is_met:
-                    patch_note = "\n🎉 Signal Scan complete (constraints respected)."
-                else:
-                    patch_note = "\n[AI NOTE] Review constraint violations."
-            elif stage == '4':
-                is_met, msg = check_stage4_exit_rule(ai_response)
-                exit_rule_status_message = msg
-                patch_note = "\n🎉 Prototype plan valid. Start building & test!" if is_met else "\n[AI NOTE] Complete missing Stage 4 sections."
-            # ── NEW: Meta-Mode branch ───────────────────────────────────────
-            elif meta_flag:
-                is_met, msg = check_stage5_exit_rule(ai_response)
-                exit_rule_status_message = msg
-                patch_note = "\n🧠 Meta-Mode reflection logged. Resume previous stage when ready." if is_met else "\n[AI NOTE] Improve Meta-Mode section coverage."
+            # Numbered stages take precedence; otherwise a [META] prompt gets
+            # the Meta-Mode checker (typing "meta" as the stage alone does not)
+            dispatch = _STAGE_DISPATCH.get(stage) if stage.isdigit() else None
+            if dispatch is None and meta_flag:
+                dispatch = _STAGE_DISPATCH['meta']
+            if dispatch:
+                checker, met_note, unmet_note = dispatch
+                is_met, exit_rule_status_message = checker(ai_response, user_prompt, prompt_lower)
+                patch_note = met_note if is_met else unmet_note
 
             # Fallback: ensure we never pass an empty patch_note
             if not patch_note:
@@ -811,7 +1306,7 @@ def main():
             logger.log_interaction(stage, user_prompt, ai_response, scores)
             
             # Weekly check
-            if datetime.now().weekday() == 0:  # Monday
+            if time.localtime().tm_wday == 0:  # Monday
                 weekly_self_patch_ritual(logger)
                 
     except KeyboardInterrupt:
@@ -822,6 +1317,17 @@ def read_multiline(prompt: str = "Your prompt ➜ ") -> str:
     """Read multiline input until EOF marker."""
     print(prompt + "(finish with EOF on its own line)")
     lines = []
+    if not sys.stdin.isatty():
+        # Piped input: pull lines straight off the buffered stream rather than
+        # through input(), stopping at the marker so later prompts still get
+        # their own lines
+        for line in iter(sys.stdin.readline, ""):
+            if line.endswith("\n"):
+                line = line[:-1]
+            if line.strip().upper() == "EOF":
+                break
+            lines.append(line)
+        return "\n".join(lines).strip()
     while True:
         try:
             line = input()
@@ -832,19 +1338,19 @@ def read_multiline(prompt: str = "Your prompt ➜ ") -> str:
             break
     return "\n".join(lines).strip()
 
+_OVERWHELM_STRATEGIES = {
+    "scattered": "Break into 3 micro-tasks under 15 minutes each",
+    "heavy": "Identify one core element to address now",
+    "overwhelmed": "Find the smallest executable component",
+    "stuck": "Reverse-engineer from desired outcome"
+}
+
 def handle_overwhelm(user_prompt: str, emotional_state: str) -> dict:
     """
     Implements the Pause • Name • Resize • Continue loop
     Returns structured data for the AI to generate resized tasks
     """
-    overwhelm_patterns = {
-        "scattered": "Break into 3 micro-tasks under 15 minutes each",
-        "heavy": "Identify one core element to address now",
-        "overwhelmed": "Find the smallest executable component",
-        "stuck": "Reverse-engineer from desired outcome"
-    }
-    
-    strategy = overwhelm_patterns.get(emotional_state.lower(), 
+    strategy = _OVERWHELM_STRATEGIES.get(emotional_state.lower(), 
                "Divide into smaller chunks and prioritize")
     
     return {
@@ -858,13 +1364,35 @@ def handle_overwhelm(user_prompt: str, emotional_state: str) -> dict:
         )
     }
 
+# Trigger phrases for the per-turn dispatch, matched against the lowercased prompt
+_META_TRIGGERS = (
+    "why did the framework",
+    "how does this stage",
+    "explain the system",
+    "meta-mode",
+    "system reflection"
+)
+# Most frequent first (per the logged prompts) so any() stops early
+_OVERWHELM_KEYWORDS = ("overwhelm", "stuck", "can't decide", "too much")
+
+def classify_prompt(user_prompt: str, prompt_lower: str | None = None) -> tuple[bool, bool]:
+    """Return (is_meta_query, is_overwhelmed) from one lowercased copy of the prompt.
+
+    Plain substring checks on a single lowered string beat a regex
+    alternation (or an automaton) for a handful of short literal phrases.
+    """
+    lowered = user_prompt.lower() if prompt_lower is None else prompt_lower
+    return (
+        any(trigger in lowered for trigger in _META_TRIGGERS),
+        any(keyword in lowered for keyword in _OVERWHELM_KEYWORDS),
+    )
+
 def process_stage(stage: str, user_prompt: str) -> list:
     """
     Enhanced stage processor with emotion-aware handling
     """
     # Detect overwhelm signals
-    overwhelm_keywords = ["overwhelm", "stuck", "can't decide", "too much"]
-    if any(kw in user_prompt.lower() for kw in overwhelm_keywords):
+    if classify_prompt(user_prompt)[1]:
         emotion = extract_emotion(user_prompt)  # Implemented elsewhere
         resize_data = handle_overwhelm(user_prompt, emotion)
         return [{
@@ -880,31 +1408,31 @@ def check_meta_mode(user_prompt: str) -> bool:
     """
     Detects when user is requesting framework-level reflection
     """
-    meta_triggers = [
-        "why did the framework",
-        "how does this stage",
-        "explain the system",
-        "meta-mode",
-        "system reflection"
-    ]
-    return any(trigger in user_prompt.lower() for trigger in meta_triggers)
+    return classify_prompt(user_prompt)[0]
+
+def _new_weekly_insights() -> dict:
+    """Fresh weekly aggregates; score_trends keeps a running [count, total] per metric."""
+    return {
+        'emotional_patterns': defaultdict(int),
+        'stage_completion_rates': defaultdict(float),
+        'common_stuck_points': defaultdict(int),
+        'score_trends': defaultdict(lambda: [0, 0])
+    }
+
+# Newest entries kept in FrameworkLogger.session_log (weekly aggregates cover the rest)
+_SESSION_LOG_MAXLEN = 10000
 
 class FrameworkLogger:
     """Enhanced interaction logger with patch note generation"""
     def __init__(self):
-        self.session_log = []
-        self.weekly_insights = {
-            'emotional_patterns': defaultdict(int),
-            'stage_completion_rates': defaultdict(float),
-            'common_stuck_points': defaultdict(int),
-            'score_trends': defaultdict(list)
-        }
+        self.session_log = deque(maxlen=_SESSION_LOG_MAXLEN)
+        self.weekly_insights = _new_weekly_insights()
 
     def log_interaction(self, stage: str, user_prompt: str, 
                        ai_response: str, scores: dict):
         """Logs complete interaction data"""
         entry = {
-            'timestamp': datetime.now().isoformat(),
+            'ts_ns': time.time_ns(),  # formatted on demand via format_ts
             'stage': stage,
             'user_prompt': user_prompt,
             'ai_response': ai_response,
@@ -915,25 +1443,35 @@ class FrameworkLogger:
         self.session_log.append(entry)
         self._update_weekly_insights(entry)
 
+    @staticmethod
+    def format_ts(ts_ns: int) -> str:
+        """ISO-8601 local time for an entry's ``ts_ns``."""
+        return datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+
     def _update_weekly_insights(self, entry: dict):
         """Updates aggregated metrics"""
+        insights = self.weekly_insights
+        stage = entry['stage']
+        scores = entry['scores']
+
         # Track emotional state frequencies
-        self.weekly_insights['emotional_patterns'][entry['emotional_state']] += 1
+        insights['emotional_patterns'][entry['emotional_state']] += 1
         
         # Calculate stage completion rates
-        is_complete = entry['scores'].get('stage_alignment', 0) >= 7
-        self.weekly_insights['stage_completion_rates'][entry['stage']] = (
-            self.weekly_insights['stage_completion_rates'].get(entry['stage'], 0) * 0.9 + 
-            is_complete * 0.1
-        )
+        is_complete = scores.get('stage_alignment', 0) >= 7
+        completion_rates = insights['stage_completion_rates']
+        completion_rates[stage] = completion_rates.get(stage, 0) * 0.9 + is_complete * 0.1
         
         # Identify common stuck points
-        if entry['scores'].get('utility', 0) < 4:
-            self.weekly_insights['common_stuck_points'][entry['stage']] += 1
+        if scores.get('utility', 0) < 4:
+            insights['common_stuck_points'][stage] += 1
         
-        # Track score trends
-        for metric, score in entry['scores'].items():
-            self.weekly_insights['score_trends'][metric].append(score)
+        # Track score trends (running count and total; reports only need the mean)
+        score_trends = insights['score_trends']
+        for metric, score in scores.items():
+            trend = score_trends[metric]
+            trend[0] += 1
+            trend[1] += score
 
 def weekly_self_patch_ritual(logger: FrameworkLogger):
     """Formal weekly review and framework update process"""
@@ -948,11 +1486,7 @@ def weekly_self_patch_ritual(logger: FrameworkLogger):
     print(f"\nTop Stuck Points:\n{report['stuck_points']}")
     
     # Guide user through update process
-    proposed_updates = []
-    for insight in report['suggested_updates']:
-        response = input(f"\nApply update: {insight}? (y/n) ")
-        if response.lower() == 'y':
-            proposed_updates.append(insight)
+    proposed_updates = _select_updates(report['suggested_updates'])
     
     # Implement approved updates
     if proposed_updates:
@@ -962,7 +1496,20 @@ def weekly_self_patch_ritual(logger: FrameworkLogger):
         print("\n🔄 No changes made this week")
     
     # Reset weekly tracker
-    logger.weekly_insights = defaultdict(lambda: defaultdict(list))
+    logger.weekly_insights = _new_weekly_insights()
+
+def _select_updates(updates: list) -> list:
+    """Ask once which suggested updates to apply; accepts "1,3", "all" or "none"."""
+    if not updates:
+        return []
+    print("\nSuggested updates:")
+    for i, update in enumerate(updates, 1):
+        print(f"  {i}. {update}")
+    sel = input("Apply which? (comma-separated numbers, or 'all'/'none'): ").strip().lower()
+    if sel in ("all", "y", "yes"):
+        return list(updates)
+    chosen = {int(x) for x in sel.replace(" ", "").split(",") if x.isdigit()}
+    return [update for i, update in enumerate(updates, 1) if i in chosen]
 
 def generate_insight_report(insights: dict) -> dict:
     """Generates actionable insights from logged data"""
@@ -974,31 +1521,29 @@ def generate_insight_report(insights: dict) -> dict:
     }
     
     # Emotional pattern analysis
-    top_emotions = sorted(insights['emotional_patterns'].items(), 
-                         key=lambda x: -x[1])[:3]
-    report['emotional_insights'] = "\n".join(
+    top_emotions = nlargest(3, insights['emotional_patterns'].items(), key=itemgetter(1))
+    report['emotional_insights'] = "\n".join([
         f"- {e[0]}: {e[1]} occurrences" for e in top_emotions
-    )
+    ])
     
     # Stage performance analysis
-    report['stage_insights'] = "\n".join(
+    report['stage_insights'] = "\n".join([
         f"- Stage {s}: {c:.1%} completion" 
         for s, c in insights['stage_completion_rates'].items()
-    )
+    ])
     
     # Stuck point recommendations
-    stuck_stages = sorted(insights['common_stuck_points'].items(),
-                         key=lambda x: -x[1])[:2]
+    stuck_stages = nlargest(2, insights['common_stuck_points'].items(), key=itemgetter(1))
     for stage, count in stuck_stages:
         report['suggested_updates'].append(
             f"Enhance {stage} guidance (appeared stuck {count} times)"
         )
     
     # Score trend suggestions
-    for metric, scores in insights['score_trends'].items():
-        if len(scores) > 10 and sum(scores)/len(scores) < 5:
+    for metric, (count, total) in insights['score_trends'].items():
+        if count > 10 and total / count < 5:
             report['suggested_updates'].append(
-                f"Review {metric} scoring criteria (avg: {sum(scores)/len(scores):.1f})"
+                f"Review {metric} scoring criteria (avg: {total / count:.1f})"
             )
     
     return report
@@ -1015,9 +1560,12 @@ def apply_framework_updates(updates: list):
         'rationale': "Weekly Self-Patch Ritual"
     }
     
-    # Save to version history
-    with open("framework_changelog.json", "a") as f:
-        f.write(json.dumps(changelog) + "\n")
+    # Save to version history as one unbuffered write, so a crash cannot leave
+    # half a record behind. Stdlib json keeps the line format the same whether
+    # or not orjson is installed.
+    payload = (json.dumps(changelog) + "\n").encode("utf-8")
+    with open("framework_changelog.json", "ab", buffering=0) as f:
+        f.write(payload)
     
     # Update framework components
     for update in updates:
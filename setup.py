@@ -12,6 +12,15 @@ setup(
     ],
     python_requires='>=3.8',
     extras_require={
+        'fast': [
+            'orjson',
+        ],
+        'http2': [
+            'h2',
+        ],
+        'aiohttp': [
+            'openai[aiohttp]',
+        ],
         'test': [
             'pytest',
             'pytest-cov',
@@ -15,4 +15,15 @@ def set_env_vars(monkeypatch):
 
 @pytest.fixture
 def logger():
-    return FrameworkLogger() 
\ No newline at end of file
+    return FrameworkLogger() 
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    """Point main at a fresh in-memory DuckDB with an empty write buffer and recent tail"""
+    from self_evolution_experiment import main
+    monkeypatch.setattr(main, "DB_PATH", ":memory:")
+    monkeypatch.setattr(main, "CONN", main.init_database())
+    monkeypatch.setattr(main, "_PENDING", [])
+    monkeypatch.setattr(main, "_RECENT", main.deque(maxlen=main._RECENT_SIZE))
+    monkeypatch.setattr(main, "_RECENT_LOADED", False)
+    return main.CONN
@@ -17,6 +17,8 @@ def test_log_interaction():
         constraints=[]
     )
     assert len(logger.session_log) == 1
+    assert logger.session_log[0].stage == '3'
+    assert logger.session_log[0].constraints == ()
 
 def test_weekly_insight_generation(logger):
     """Test insight aggregation over multiple interactions"""
@@ -47,4 +49,38 @@ def test_constraint_detection():
     logger = FrameworkLogger()
     constrained_prompt = "Do exactly 3 things and nothing more"
     constraints = logger._detect_constraints(constrained_prompt)
-    assert "exactly 3 things" in constraints 
\ No newline at end of file
+    assert "exactly 3 things" in constraints 
+
+def test_score_trends_running_mean(logger):
+    """Score trends keep a running count and total, and reports use the mean"""
+    for clarity in (4, 6, 8):
+        logger.log_interaction('1', "p", "r", {'clarity': clarity}, 'flow')
+    assert logger.weekly_insights['score_trends']['clarity'] == [3, 18]
+    assert "- clarity: 6.00" in logger.generate_insight_report(logger.weekly_insights)
+    assert logger.weekly_self_patch_ritual()['score_trends'] == {'clarity': 6.0}
+
+def test_log_interactions_batch_matches_single(logger):
+    """Batch logging produces the same insights as logging one at a time"""
+    interactions = [
+        ('3', "p", "r", {'clarity': 5, 'utility': 3}, 'stuck'),
+        ('2', "p", "r", {'clarity': 8, 'utility': 7}, 'flow', ["no advice"]),
+        ('3', "p", "r", {'clarity': 4, 'utility': 2}, 'stuck'),
+    ]
+    single = FrameworkLogger()
+    for item in interactions:
+        single.log_interaction(*item)
+    logger.log_interactions_batch(interactions)
+    assert logger.weekly_insights == single.weekly_insights
+    assert logger.session_log == single.session_log
+    assert type(logger.weekly_insights['stage_completion_rates']['3']) is float
+    assert "- Stage 3: 2.0 completions" in logger.generate_insight_report(logger.weekly_insights)
+
+def test_session_log_is_bounded(monkeypatch):
+    """Only the newest entries stay in the session log; aggregates keep counting"""
+    from self_evolution_experiment import framework
+    monkeypatch.setattr(framework, "_SESSION_LOG_MAXLEN", 2)
+    logger = FrameworkLogger()
+    for stage in ('1', '2', '3'):
+        logger.log_interaction(stage, "p", "r", {'clarity': 5}, 'calm')
+    assert [entry.stage for entry in logger.session_log] == ['2', '3']
+    assert logger.weekly_insights['stage_completion_rates']['1'] == 1
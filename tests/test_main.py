@@ -1,8 +1,15 @@
 import os
-from unittest.mock import patch, MagicMock
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from self_evolution_experiment import main
 from self_evolution_experiment.main import chat
 
-@patch('self_evolution_experiment.main.OpenAI')
+@pytest.fixture(autouse=True)
+def reset_client(monkeypatch):
+    """Each test gets a fresh cached client so OpenAI mocks take effect"""
+    monkeypatch.setattr(main, "_CLIENT", None)
+
+@patch('openai.OpenAI')
 def test_chat_success(mock_openai):
     """Test basic successful API call"""
     # Setup mock response
@@ -35,7 +42,7 @@ def test_chat_success(mock_openai):
         temperature=0.7
     )
 
-@patch('self_evolution_experiment.main.OpenAI')
+@patch('openai.OpenAI')
 def test_chat_failure(mock_openai):
     """Test API failure handling"""
     # Setup mock to raise exception
@@ -48,4 +55,337 @@ def test_chat_failure(mock_openai):
         chat([])
         assert False, "Should have raised exception"
     except Exception as e:
-        assert str(e) == "API error" 
\ No newline at end of file
+        assert str(e) == "API error" 
+
+
+def test_save_interaction_batches(monkeypatch, memory_db):
+    """Interactions are buffered and written in one batch on flush"""
+    monkeypatch.setattr(main, "_FLUSH_INTERVAL", float("inf"))
+
+    main.save_interaction("1", "prompt", "response", {"clarity": 8}, "note")
+    main.save_interaction("meta", "prompt", "response", {}, "note", is_meta=True)
+    assert main.CONN.execute("SELECT COUNT(*) FROM interactions").fetchone()[0] == 0
+
+    main.flush_interactions()
+    rows = main.CONN.execute("SELECT stage, is_meta FROM interactions ORDER BY timestamp").fetchall()
+    assert rows == [("1", False), ("meta", True)]
+    assert main._PENDING == []
+
+    # A row arriving after a quiet spell is written straight away
+    monkeypatch.setattr(main, "_FLUSH_INTERVAL", 5.0)
+    monkeypatch.setattr(main, "_LAST_FLUSH", main.time.monotonic() - 10)
+    main.save_interaction("2", "prompt", "response", {}, "note")
+    assert main._PENDING == []
+    assert main.CONN.execute("SELECT COUNT(*) FROM interactions").fetchone()[0] == 3
+
+def test_failed_flush_drops_the_batch(monkeypatch, memory_db):
+    """Rows from a failed insert are dropped, so later flushes do not repeat the error"""
+    monkeypatch.setattr(main, "_FLUSH_INTERVAL", float("inf"))
+    main.save_interaction("1", "prompt", "response", {}, "note")
+    with monkeypatch.context() as broken:
+        broken.setattr(main, "_INSERT_SQL", "INSERT INTO missing_table SELECT unnest(?)")
+        main.flush_interactions()
+    assert main._PENDING == []
+
+    main.save_interaction("2", "prompt", "response", {}, "note")
+    main.flush_interactions()
+    assert main.CONN.execute("SELECT stage FROM interactions").fetchall() == [("2",)]
+
+@patch('openai.OpenAI')
+def test_chat_reuses_client(mock_openai):
+    """The OpenAI client is built once and shared across calls"""
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    mock_client.chat.completions.create.return_value.choices[0].message.content = "ok"
+
+    chat([{"role": "user", "content": "one"}])
+    chat([{"role": "user", "content": "two"}])
+
+    mock_openai.assert_called_once()
+    assert mock_client.chat.completions.create.call_count == 2
+
+def test_client_transport_fallbacks(monkeypatch):
+    """A failing aiohttp transport or an openai without Default*Client falls back"""
+    import openai
+    def broken_aiohttp():
+        raise RuntimeError("httpx_aiohttp missing")
+    monkeypatch.setattr(main, "_AIOHTTP", True)
+    monkeypatch.setattr(openai, "DefaultAioHttpClient", broken_aiohttp, raising=False)
+    monkeypatch.setattr(openai, "DefaultAsyncHttpxClient", lambda http2: "httpx", raising=False)
+    assert main._async_http_client() == "httpx"
+
+    monkeypatch.delattr(openai, "DefaultAsyncHttpxClient")
+    assert main._async_http_client() is None
+    monkeypatch.delattr(openai, "DefaultHttpxClient", raising=False)
+    with patch('openai.OpenAI') as mock_openai:
+        main.get_client()
+    assert mock_openai.call_args.kwargs["http_client"] is None
+
+@patch('openai.AsyncOpenAI')
+def test_run_batch(mock_async_openai, monkeypatch, memory_db):
+    """Batch prompts are generated, evaluated and buffered concurrently"""
+    monkeypatch.setattr(main, "_FLUSH_INTERVAL", float("inf"))
+    replies = {
+        "stage": MagicMock(),
+        "judge": MagicMock(),
+    }
+    replies["stage"].choices[0].message.content = "Key Themes:\n- a\n- b\n- c"
+    replies["judge"].choices[0].message.content = '{"scores": {"clarity": 9}, "patch_note": "good"}'
+
+    async def fake_create(**kwargs):
+        return replies["judge"] if "response_format" in kwargs else replies["stage"]
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=fake_create)
+    mock_async_openai.return_value = mock_client
+
+    results = main.run_batch([("1", "idea one"), ("1", "idea two")])
+
+    assert [r[1] for r in results] == [{"clarity": 9}, {"clarity": 9}]
+    assert mock_client.chat.completions.create.await_count == 4
+    mock_async_openai.assert_called_once()
+    assert len(main._PENDING) == 2
+
+@patch('openai.AsyncOpenAI')
+def test_run_eval_batch(mock_async_openai, memory_db):
+    """Logged exchanges are judged concurrently and returned in input order"""
+    judged = MagicMock()
+    judged.choices[0].message.content = '{"scores": {"clarity": 6}, "patch_note": "ok"}'
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=judged)
+    mock_async_openai.return_value = mock_client
+
+    exchanges = [("1", "p1", "r1", False), ("2", "p2", "r2", False), ("1", "p1", "r1", False)]
+    results = main.run_eval_batch(exchanges, max_concurrency=2)
+
+    assert results == [({"clarity": 6}, "ok")] * 3
+
+@patch('openai.AsyncOpenAI')
+def test_batches_open_a_client_per_run(mock_async_openai, monkeypatch, memory_db):
+    """Each asyncio.run gets its own async client, closed before its loop ends"""
+    monkeypatch.setattr(main, "_FLUSH_INTERVAL", float("inf"))
+    reply = MagicMock()
+    reply.choices[0].message.content = '{"scores": {"clarity": 8}, "patch_note": "ok"}'
+    clients = []
+
+    def make_client(**kwargs):
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=reply)
+        clients.append(client)
+        return client
+
+    mock_async_openai.side_effect = make_client
+
+    main.run_batch([("1", "idea one")])
+    main.run_batch([("1", "idea two")])
+    main.run_eval_batch([("2", "p", "r", False)])
+
+    assert len(clients) == 3
+    for client in clients:
+        client.__aexit__.assert_awaited_once()
+        assert client.chat.completions.create.await_count >= 1
+
+@patch('openai.AsyncOpenAI')
+def test_run_batch_keeps_per_item_errors(mock_async_openai, monkeypatch, memory_db):
+    """A failed prompt comes back as its exception without losing the others"""
+    monkeypatch.setattr(main, "_FLUSH_INTERVAL", float("inf"))
+    reply = MagicMock()
+    reply.choices[0].message.content = '{"scores": {"clarity": 9}, "patch_note": "good"}'
+
+    async def fake_create(**kwargs):
+        if kwargs["messages"][-1]["content"] == "bad idea":
+            raise RuntimeError("rate limited")
+        return reply
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=fake_create)
+    mock_async_openai.return_value = mock_client
+
+    results = main.run_batch([("1", "good idea"), ("1", "bad idea")])
+
+    assert results[0][1] == {"clarity": 9}
+    assert isinstance(results[1], RuntimeError)
+    assert len(main._PENDING) == 1
+
+def test_extract_json_response_strips_fences():
+    """Fenced replies parse without the regex fence strip"""
+    assert main.extract_json_response('```json\n{"scores": {"clarity": 7}}\n```') == {"scores": {"clarity": 7}}
+    assert main.extract_json_response('```\n[1, 2]\n```') == [1, 2]
+    assert main._strip_fences('```JSON {"a": 1}```') == '{"a": 1}'
+    assert main.extract_json_response('Scores: {"patch_note": "}"} then {more}') == {"patch_note": "}"}
+    assert main._strip_fences('```python\nx = 1\n```').startswith('```python')
+
+@patch('openai.OpenAI')
+def test_self_eval_cache(mock_openai, memory_db):
+    """A repeated exchange is judged once and then served from eval_cache"""
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    full_scores = dict.fromkeys(sorted(main._RUBRIC_KEYS), 9)
+    mock_client.chat.completions.create.return_value.choices[0].message.content = (
+        main._json_dumps({"scores": full_scores, "patch_note": "good"})
+    )
+
+    first = main.self_eval("1", "prompt", "response")
+    second = main.self_eval("1", "prompt", "response")
+
+    assert first == second == (full_scores, "good")
+    assert mock_client.chat.completions.create.call_count == 1
+
+@patch('openai.OpenAI')
+def test_self_eval_skips_caching_degraded_parses(mock_openai, memory_db):
+    """Scraped or incomplete judge replies are not cached, so the judge is asked again"""
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    reply = mock_client.chat.completions.create.return_value.choices[0].message
+    for content in ("clarity: 8\nNote: mostly fine", '{"scores": {"clarity": 9}, "patch_note": "good"}'):
+        reply.content = content
+        main.self_eval("1", "prompt", "response")
+        main.self_eval("1", "prompt", "response")
+
+    assert mock_client.chat.completions.create.call_count == 4
+    assert main.CONN.execute("SELECT COUNT(*) FROM eval_cache").fetchone()[0] == 0
+
+@patch('openai.OpenAI')
+def test_self_eval_cache_key(mock_openai, monkeypatch, memory_db):
+    """A new rubric or judge model misses the cache; a failed lookup falls back"""
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    mock_client.chat.completions.create.return_value.choices[0].message.content = (
+        main._json_dumps({"scores": dict.fromkeys(sorted(main._RUBRIC_KEYS), 9), "patch_note": "good"})
+    )
+
+    main.self_eval("1", "prompt", "response")
+    main.self_eval("1", "prompt", "response")
+    assert mock_client.chat.completions.create.call_count == 1
+    monkeypatch.setattr(main, "_RUBRIC_PROMPT", main._RUBRIC_PROMPT + "\n- focus: Is it focused?")
+    main.self_eval("1", "prompt", "response")
+    monkeypatch.setattr(main, "MODEL", "other-model")
+    main.self_eval("1", "prompt", "response")
+    assert mock_client.chat.completions.create.call_count == 3
+
+    def broken_lookup(key):
+        raise main.duckdb.Error("database is locked")
+    monkeypatch.setattr(main, "_cached_eval", broken_lookup)
+    scores, _ = main.self_eval("1", "Key Themes", "- a\n- b\n- c")
+    assert scores["_method"] == "heuristic"
+
+@patch('openai.OpenAI')
+def test_chat_stream(mock_openai, capsys):
+    """Streamed replies are echoed as they arrive and returned whole"""
+    chunks = []
+    for piece in ("Key ", "Themes", None):
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = piece
+        chunks.append(chunk)
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    mock_client.chat.completions.create.return_value = iter(chunks)
+
+    assert chat([{"role": "user", "content": "hi"}], stream=True) == "Key Themes"
+    assert "Key Themes\n" in capsys.readouterr().out
+    assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+def test_read_multiline_piped(monkeypatch):
+    """Piped input stops at the EOF marker and leaves the rest for later prompts"""
+    import io
+    monkeypatch.setattr("sys.stdin", io.StringIO("line one\n  line two\neof\n1\n"))
+    assert main.read_multiline() == "line one\n  line two"
+    assert input() == "1"
+
+def test_export_interactions(tmp_path, memory_db):
+    """Exported Parquet is partitioned by date and stage"""
+    main.save_interaction("1", "prompt", "response", {"clarity": 8}, "note")
+
+    target = main.export_interactions(tmp_path / "logs")
+
+    assert list(target.glob("date=*/stage=1/*.parquet"))
+    rows = main.CONN.execute(
+        f"SELECT stage FROM read_parquet('{target}/**/*.parquet', hive_partitioning=1, hive_types_autocast=0)"
+    ).fetchall()
+    assert rows == [("1",)]
+
+def test_stage2_exit_rule_single_pass():
+    """Stage 2 components are tallied in one scan"""
+    response = (
+        "Pattern 1: drift\nEvidence: notes\nConfidence: High\n"
+        "  Pattern 2: focus\n  Evidence: logs\n  Confidence: medium\n\n"
+        "Core Motivation: ship\nEmotional Shift: scattered to calm"
+    )
+    assert main.check_stage2_exit_rule(response)[0]
+    met, message = main.check_stage2_exit_rule("Pattern 1:\nPattern 2: x\nCore Motivation: y")
+    assert not met
+    assert message.endswith("Patterns, Evidences, Confidences, Emotional Shift")
+
+def test_recent_interactions(monkeypatch, memory_db):
+    """The Meta-Mode tail is seeded from the database once, then kept in memory"""
+    monkeypatch.setattr(main, "_FLUSH_INTERVAL", float("inf"))
+    for stage in "012":
+        main.save_interaction(stage, "p" + stage, "r" + stage, {}, "")
+
+    assert main.recent_interactions(2) == [("2", "p2", "r2"), ("1", "p1", "r1")]
+    # Seeding flushed the buffered rows to the database
+    assert main.CONN.execute("SELECT stage FROM interactions ORDER BY timestamp").fetchall() == [
+        ("0",), ("1",), ("2",)
+    ]
+
+    main.save_interaction("3", "p3", "r3", {"clarity": 7}, "note")
+    assert main.recent_interactions() == [("3", "p3", "r3"), ("2", "p2", "r2"), ("1", "p1", "r1")]
+    # The new row is served from memory while still waiting in the write buffer
+    assert [row[2:] for row in main._PENDING] == [("3", "p3", "r3", main._json_dumps({"clarity": 7}), "note", False)]
+
+def test_uuid7_ids():
+    """Interaction ids are RFC 9562 version-7 UUIDs ordered by creation time"""
+    import uuid
+    first, second = main._uuid7(), main._uuid7()
+    assert uuid.UUID(first).version == 7
+    assert first[:13] <= second[:13]
+
+def test_meta_concepts_single_scan():
+    """Meta-Mode key concepts are found in one scan, even when adjacent"""
+    assert main._meta_concepts("improvementsynthesize") == ["pathways", "refinements"]
+    assert main._meta_concepts("Try a 5 min micro-action") == ["micro_action"]
+    assert main._meta_concepts("nothing here") == []
+
+def test_classify_prompt():
+    """Meta-query and overwhelm triggers are both read from one pass over the prompt"""
+    assert main.classify_prompt("Explain the SYSTEM, I'm stuck") == (True, True)
+    assert main.classify_prompt("Feeling overwhelmed today") == (False, True)
+    assert main.classify_prompt("Plan my week") == (False, False)
+
+def test_stage_dispatch_table():
+    """Every stage entry runs its exit rule and carries both patch notes"""
+    for stage, (checker, met_note, unmet_note) in main._STAGE_DISPATCH.items():
+        is_met, msg = checker("", "", "")
+        assert not is_met and msg
+        assert met_note != unmet_note
+    checker = main._STAGE_DISPATCH['3'][0]
+    assert checker is main.check_stage3_exit_rule
+
+def test_select_updates(monkeypatch):
+    """One prompt picks any subset of the suggested updates"""
+    updates = ["Enhance 3 guidance", "Enhance 1 guidance", "Review tone scoring criteria"]
+    for reply, expected in [("1, 3", [updates[0], updates[2]]), ("all", updates), ("none", []), ("9", [])]:
+        monkeypatch.setattr("builtins.input", lambda _prompt, r=reply: r)
+        assert main._select_updates(updates) == expected
+    assert main._select_updates([]) == []
+
+def test_env_log_level(monkeypatch):
+    """Valid level names are used; anything else falls back to WARNING"""
+    import logging
+    monkeypatch.setenv("SELF_EVO_LOG_LEVEL", "debug")
+    assert main._env_log_level() == logging.DEBUG
+    monkeypatch.setenv("SELF_EVO_LOG_LEVEL", "verbose")
+    assert main._env_log_level() == logging.WARNING
+
+def test_env_max_concurrency(monkeypatch):
+    """Positive integers are used; anything else falls back to the default"""
+    monkeypatch.setenv("DEEPSEEK_MAX_CONCURRENCY", "8")
+    assert main._env_max_concurrency() == 8
+    for value in ("many", "0", "-2"):
+        monkeypatch.setenv("DEEPSEEK_MAX_CONCURRENCY", value)
+        assert main._env_max_concurrency() == 5
+
+def test_run_batch_rejects_zero_concurrency():
+    """A zero limit is refused instead of waiting forever on the semaphore"""
+    with pytest.raises(ValueError):
+        main.run_batch([], max_concurrency=0)